@@ -0,0 +1,140 @@
+"""
+Goodput under overload, with and without admission control.
+
+Offers more tool calls per second than a mock MCP endpoint can handle (each
+call blocks the event loop for a couple of milliseconds, like JSON encoding a
+large result) and counts the calls answered within the client's timeout.
+Without admission control every call queues and latency grows until most
+calls time out; with it the excess is shed immediately and goodput stays
+close to capacity, until merely accepting and parsing requests saturates the
+loop (then shed at a load balancer, or add workers).
+
+The endpoint runs in a uvicorn subprocess so the load generator keeps its
+own pace while the server's event loop is saturated.
+
+Run with:
+    python -m benchmarks.bench_admission
+"""
+
+import asyncio
+import subprocess
+import sys
+import time
+
+import httpx
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from utils.admission import AdmissionController, AdmissionMiddleware
+
+# Seconds of event-loop time per call: capacity is 1 / CPU_PER_CALL calls/s
+CPU_PER_CALL = 0.005
+CLIENT_TIMEOUT = 1.0
+PORT = 10950
+
+
+async def tool_call(request):
+    body = await request.json()
+    await asyncio.sleep(0.01)  # upstream I/O
+    time.sleep(CPU_PER_CALL)  # encoding the result
+    return JSONResponse({"jsonrpc": "2.0", "id": body["id"], "result": {}})
+
+
+def make_app(admission: bool):
+    """The endpoint, optionally behind admission control"""
+    app = Starlette(routes=[Route("/weather/mcp/", tool_call, methods=["POST"])])
+    if not admission:
+        return app
+    controller = AdmissionController(
+        {"/weather": "weather"},
+        server_concurrency=16,
+        queue_size=32,
+        queue_timeout=0.1,
+    )
+    return AdmissionMiddleware(app, controller)
+
+
+plain_app = make_app(admission=False)
+admitted_app = make_app(admission=True)
+
+
+def serve(admission: bool) -> subprocess.Popen:
+    app = "admitted_app" if admission else "plain_app"
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            f"benchmarks.bench_admission:{app}",
+            "--port",
+            str(PORT),
+            "--log-level",
+            "warning",
+        ]
+    )
+    for _ in range(100):
+        try:
+            httpx.get(f"http://127.0.0.1:{PORT}/")
+            break
+        except httpx.TransportError:
+            time.sleep(0.1)
+    return server
+
+
+async def run(rate: int, seconds: float) -> dict:
+    """Send ``rate`` calls per second for ``seconds`` and count the outcomes"""
+    outcomes = {"ok": 0, "shed": 0, "timeout": 0}
+    client = httpx.AsyncClient(
+        base_url=f"http://127.0.0.1:{PORT}",
+        limits=httpx.Limits(max_connections=None, max_keepalive_connections=None),
+    )
+
+    async def one(id: int) -> None:
+        payload = {"jsonrpc": "2.0", "id": id, "method": "tools/call", "params": {}}
+        try:
+            async with asyncio.timeout(CLIENT_TIMEOUT):
+                response = await client.post("/weather/mcp/", json=payload)
+        except (TimeoutError, httpx.TransportError):
+            outcomes["timeout"] += 1
+            return
+        outcomes["ok" if response.status_code == 200 else "shed"] += 1
+
+    tasks = []
+    started = time.perf_counter()
+    for id in range(int(rate * seconds)):
+        # Open loop: calls are sent on schedule whatever the server does
+        delay = started + id / rate - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one(id)))
+    await asyncio.gather(*tasks)
+    await client.aclose()
+    outcomes["goodput"] = outcomes["ok"] / seconds
+    return outcomes
+
+
+def main(seconds: float = 3.0) -> None:
+    capacity = 1 / CPU_PER_CALL
+    print(f"capacity ~{capacity:.0f} calls/s, client timeout {CLIENT_TIMEOUT}s")
+    print(
+        f"{'offered':>8} {'admission':>10} {'ok':>6} {'shed':>6} {'timeout':>8} "
+        f"{'goodput':>10}"
+    )
+    for rate in (int(capacity * 0.5), int(capacity * 1.5), int(capacity * 2)):
+        for admission in (False, True):
+            server = serve(admission)
+            try:
+                result = asyncio.run(run(rate, seconds))
+            finally:
+                server.terminate()
+                server.wait()
+            print(
+                f"{rate:>6}/s {'on' if admission else 'off':>10} {result['ok']:>6} "
+                f"{result['shed']:>6} {result['timeout']:>8} "
+                f"{result['goodput']:>8.0f}/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Bandwidth/latency tradeoff of compressing tool results.
+
+Encodes payloads shaped like our largest tool results (as the indented JSON
+FastMCP returns) with every available encoder and reports the compressed size,
+the time to compress, and the estimated time to deliver the body to a remote
+client over a few link speeds.
+
+Run with:
+    python -m benchmarks.bench_compression
+"""
+
+import random
+import timeit
+
+from benchmarks.bench_json import conversion_rates_payload, news_payload
+from utils.compression import ENCODERS
+from utils.serialization import dumps
+
+# Link speeds of remote agent clients, in Mbit/s
+LINKS = (1, 10, 100)
+
+
+def forecast_payload(slots: int = 40) -> dict:
+    """A 5-day forecast with every 3-hour slot"""
+    return {
+        "city": "London",
+        "country": "GB",
+        "forecasts": [
+            {
+                "datetime": f"2024-01-0{1 + i // 8} {i % 8 * 3:02d}:00:00",
+                "temperature": round(random.uniform(-5, 15), 2),
+                "description": random.choice(["light rain", "clear sky", "mist"]),
+                "humidity": random.randint(40, 100),
+                "wind_speed": round(random.uniform(0, 12), 2),
+            }
+            for i in range(slots)
+        ],
+    }
+
+
+def _compress(encoding: str, data: bytes) -> bytes:
+    encoder = ENCODERS[encoding]()
+    return encoder.compress(data) + encoder.finish()
+
+
+def main(number: int = 200) -> None:
+    random.seed(0)
+    links = "".join(f"{f'@{mbit}Mb/s':>10}" for mbit in LINKS)
+    print(f"available encoders: {', '.join(ENCODERS)}")
+
+    for name, payload in (
+        ("conversion_rates", conversion_rates_payload()),
+        ("news (100 articles)", news_payload()),
+        ("forecast (40 slots)", forecast_payload()),
+    ):
+        raw = dumps(payload, indent=True)
+        print(f"\n{name}: {len(raw) / 1024:.1f} KiB")
+        print(f"  {'encoding':<10}{'size':>10}{'ratio':>8}{'cpu':>10}{links}")
+
+        for encoding in ("identity", *ENCODERS):
+            if encoding == "identity":
+                size, seconds = len(raw), 0.0
+            else:
+                size = len(_compress(encoding, raw))
+                seconds = (
+                    min(
+                        timeit.repeat(
+                            lambda: _compress(encoding, raw), number=number, repeat=3
+                        )
+                    )
+                    / number
+                )
+            # total time = compression + transfer at each link speed
+            totals = "".join(
+                f"{(seconds + size * 8 / (mbit * 1e6)) * 1000:8.1f}ms" for mbit in LINKS
+            )
+            print(
+                f"  {encoding:<10}{size / 1024:8.1f}Ki{len(raw) / size:7.1f}x"
+                f"{seconds * 1e6:8.0f}us{totals}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Tail-latency simulation for hedged upstream requests.
+
+Drives APIClient against a mock upstream whose latency is mostly fast with a
+heavy tail (like quotable.io on a bad day), with and without hedging, and
+reports client-observed p50/p99 and the extra upstream load.
+
+Run with:
+    python -m benchmarks.bench_hedging
+"""
+
+import asyncio
+import random
+import statistics
+import time
+
+import httpx
+
+from utils.api_clients import APIClient
+
+
+def upstream_latency() -> float:
+    """~95% of requests take 20-60ms, the rest stall for 0.5-2s"""
+    if random.random() < 0.05:
+        return random.uniform(0.5, 2.0)
+    return random.uniform(0.02, 0.06)
+
+
+async def run(hedging: bool, requests: int, concurrency: int) -> tuple:
+    sent = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal sent
+        sent += 1
+        await asyncio.sleep(upstream_latency())
+        return httpx.Response(200, json={"content": "quote"})
+
+    client = APIClient(
+        base_url="https://upstream.test",
+        transport=httpx.MockTransport(handler),
+        hedging=hedging,
+    )
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await client.get("/random")
+            except httpx.TimeoutException:
+                pass
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(one() for _ in range(requests)))
+    await client.aclose()
+    latencies.sort()
+    return (
+        statistics.median(latencies),
+        latencies[int(0.99 * len(latencies)) - 1],
+        sent / requests,
+    )
+
+
+def main(requests: int = 2000, concurrency: int = 50) -> None:
+    print(f"{'mode':<10} {'p50':>8} {'p99':>8} {'upstream load':>14}")
+    for hedging in (False, True):
+        random.seed(0)
+        p50, p99, load = asyncio.run(run(hedging, requests, concurrency))
+        mode = "hedged" if hedging else "plain"
+        print(f"{mode:<10} {p50 * 1000:6.0f}ms {p99 * 1000:6.0f}ms {load:13.2f}x")
+
+
+if __name__ == "__main__":
+    main()
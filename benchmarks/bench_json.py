@@ -0,0 +1,97 @@
+"""
+Microbenchmark for the JSON paths used by the MCP servers.
+
+Compares the stdlib decoder used by ``httpx.Response.json()`` and the
+``pydantic_core.to_json`` encoder used by FastMCP against ``utils.serialization``
+(orjson when installed) on payloads shaped like our largest upstream responses.
+
+Run with:
+    python -m benchmarks.bench_json
+"""
+
+import json
+import random
+import string
+import timeit
+
+import pydantic_core
+
+from utils import serialization
+
+
+def _word(length: int) -> str:
+    return "".join(random.choices(string.ascii_lowercase, k=length))
+
+
+def conversion_rates_payload() -> dict:
+    """An exchangerate-api ``/latest`` response with a full rate table"""
+    codes = {_word(3).upper() for _ in range(400)}
+    return {
+        "result": "success",
+        "base_code": "USD",
+        "time_last_update_utc": "Mon, 01 Jan 2024 00:00:01 +0000",
+        "time_next_update_utc": "Tue, 02 Jan 2024 00:00:01 +0000",
+        "conversion_rates": {code: random.uniform(0.001, 5000) for code in codes},
+    }
+
+
+def news_payload(articles: int = 100) -> dict:
+    """A newsapi ``/everything`` response with a full page of articles"""
+    return {
+        "status": "ok",
+        "totalResults": 4213,
+        "articles": [
+            {
+                "source": {"id": None, "name": _word(12)},
+                "author": _word(16),
+                "title": " ".join(_word(7) for _ in range(12)),
+                "description": " ".join(_word(7) for _ in range(40)),
+                "url": f"https://example.com/{_word(30)}",
+                "urlToImage": f"https://example.com/{_word(30)}.jpg",
+                "publishedAt": "2024-01-01T12:00:00Z",
+                "content": " ".join(_word(7) for _ in range(30)),
+            }
+            for _ in range(articles)
+        ],
+    }
+
+
+def _bench(label: str, func, number: int) -> float:
+    seconds = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f"  {label:<32} {seconds * 1e6:10.1f} us")
+    return seconds
+
+
+def main(number: int = 500) -> None:
+    random.seed(0)
+    print(f"utils.serialization backend: {serialization.BACKEND}")
+
+    for name, payload in (
+        ("conversion_rates", conversion_rates_payload()),
+        ("news (100 articles)", news_payload()),
+    ):
+        raw = json.dumps(payload).encode()
+        print(f"\n{name}: {len(raw) / 1024:.1f} KiB")
+
+        stdlib_loads = _bench("decode  json.loads", lambda: json.loads(raw), number)
+        fast_loads = _bench(
+            "decode  serialization.loads", lambda: serialization.loads(raw), number
+        )
+        stdlib_dumps = _bench(
+            "encode  pydantic_core.to_json",
+            lambda: pydantic_core.to_json(payload, fallback=str, indent=2),
+            number,
+        )
+        fast_dumps = _bench(
+            "encode  serialization.dumps",
+            lambda: serialization.dumps(payload, indent=True),
+            number,
+        )
+        print(
+            f"  speedup: decode x{stdlib_loads / fast_loads:.2f}, "
+            f"encode x{stdlib_dumps / fast_dumps:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
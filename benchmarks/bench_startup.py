@@ -0,0 +1,62 @@
+"""
+Cold-start benchmark for the multi-server app.
+
+Each configuration runs in a fresh interpreter and reports the time to import
+``main`` and to finish the application lifespan startup, i.e. the point at
+which the pod can report ready.
+
+Run with:
+    python -m benchmarks.bench_startup
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+
+CONFIGURATIONS = {
+    "eager, all servers": {"LAZY_SERVERS": "false"},
+    "lazy, all servers": {"LAZY_SERVERS": "true"},
+    "lazy, weather only": {"LAZY_SERVERS": "true", "ENABLED_SERVERS": "weather"},
+}
+
+PROBE = """
+import asyncio, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+
+async def startup():
+    async with main.app.router.lifespan_context(main.app):
+        return time.perf_counter()
+
+ready = asyncio.run(startup())
+print(imported - start, ready - start)
+"""
+
+
+def measure(env: dict, runs: int) -> tuple:
+    imports, readies = [], []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE],
+            env={**os.environ, **env},
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        imported, ready = map(float, output.split()[-2:])
+        imports.append(imported)
+        readies.append(ready)
+    return statistics.median(imports), statistics.median(readies)
+
+
+def main(runs: int = 5) -> None:
+    print(f"{'configuration':<24} {'import main':>12} {'ready':>10}")
+    for name, env in CONFIGURATIONS.items():
+        imported, ready = measure(env, runs)
+        print(f"{name:<24} {imported * 1000:10.1f}ms {ready * 1000:8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
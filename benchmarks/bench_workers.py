@@ -0,0 +1,107 @@
+"""
+Throughput benchmark for multi-worker mode.
+
+Starts the app with 1, 2, 4, ... workers (up to the core count) and drives
+``tools/list`` requests against the quotes mount from several client
+processes, reporting requests per second for each worker count. No upstream
+API is called, so the numbers measure the MCP/HTTP stack itself. Admission
+control is turned off, as it would shed part of this closed-loop load (see
+bench_admission for its effect).
+
+Run with:
+    python -m benchmarks.bench_workers
+"""
+
+import asyncio
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+PORT = 18500
+URL = f"http://127.0.0.1:{PORT}/quotes/mcp/"
+HEADERS = {
+    "Accept": "application/json, text/event-stream",
+    "Content-Type": "application/json",
+}
+BODY = b'{"jsonrpc":"2.0","id":1,"method":"tools/list","params":{}}'
+
+
+async def _drive(duration: float, concurrency: int) -> int:
+    done = 0
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+
+        async def worker() -> None:
+            nonlocal done
+            while time.perf_counter() < deadline:
+                response = await client.post(URL, content=BODY, headers=HEADERS)
+                response.raise_for_status()
+                done += 1
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return done
+
+
+def _client(args: tuple) -> int:
+    duration, concurrency = args
+    return asyncio.run(_drive(duration, concurrency))
+
+
+def _wait_ready(timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{PORT}/health").raise_for_status()
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError("server did not become ready")
+
+
+def measure(workers: int, clients: int, duration: float, concurrency: int) -> float:
+    env = {
+        **os.environ,
+        "PORT": str(PORT),
+        "WORKERS": str(workers),
+        "WORKER_MODE": "shared",
+        "LOG_LEVEL": "warning",
+        # Measure raw throughput: no load shedding or per-client accounting
+        "ADMISSION_ENABLED": "false",
+        "USAGE_ENABLED": "false",
+    }
+    server = subprocess.Popen([sys.executable, "main.py"], env=env)
+    try:
+        _wait_ready()
+        # Warm up every worker (lazy server loading happens on first request)
+        _client((1.0, concurrency))
+        with multiprocessing.Pool(clients) as pool:
+            counts = pool.map(_client, [(duration, concurrency)] * clients)
+        return sum(counts) / duration
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main(duration: float = 5.0, concurrency: int = 32) -> None:
+    cores = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cores:
+        counts.append(counts[-1] * 2)
+
+    clients = max(1, cores // 2)
+    print(f"{cores} cores, {clients} client processes x {concurrency} connections")
+    baseline = None
+    for workers in counts:
+        rps = measure(workers, clients, duration, concurrency)
+        baseline = baseline or rps
+        print(f"  {workers:>3} workers: {rps:9.0f} req/s  (x{rps / baseline:.2f})")
+
+
+if __name__ == "__main__":
+    main()
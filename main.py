@@ -1,27 +1,82 @@
 import contextlib
-import os
-from fastapi import FastAPI
+import secrets
+from typing import Literal, Optional
+
+import anyio
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, Response
+from fastapi.responses import PlainTextResponse
 from dotenv import load_dotenv
 
-# Import all MCP servers
-from servers.weather import mcp as weather_mcp
-from servers.news import mcp as news_mcp
-from servers.currency import mcp as currency_mcp
-from servers.quotes import mcp as quote_mcp
+from utils.admission import AdmissionController, AdmissionMiddleware, header_timeout
+from utils.cache import use_snapshot
+from utils.compression import CompressionMiddleware
+from utils.config import settings
+from utils.deadline import deadline_after
+from utils.diagnostics import diagnostics
+from utils.plan import Plan, PlanError, execute_plan
+from utils.registry import ServerRegistry, discover_servers
+from utils.serialization import dumps
+from utils.shared_state import shared_store
+from utils.snapshot import CacheSnapshot
+from utils.usage import UsageMiddleware, identify, usage
+from utils.warmers import CacheWarmer
 
 # Load environment variables
 load_dotenv()
 
+# MCP servers are discovered in the servers/ package and through entry points,
+# then imported and started on first use (see utils/registry.py)
+registry = ServerRegistry(
+    discover_servers(),
+    enabled=settings.enabled_servers,
+    lazy=settings.lazy_servers,
+    json_response=settings.mcp_json_response,
+)
+
+
+# Refreshes hot cache entries of the loaded servers before they expire
+warmer = CacheWarmer(
+    settings.cache_warm_tools,
+    top_k=settings.cache_warm_top_k,
+    lead_time=settings.cache_warm_lead_time,
+    budget=settings.cache_warm_budget,
+    static_keys=settings.cache_warm_keys,
+)
+
+
+# Persists the caches so a restarted process serves warm data immediately
+snapshot = (
+    CacheSnapshot(settings.cache_snapshot_path)
+    if settings.cache_snapshot_path
+    else None
+)
+
 
-# Create a combined lifespan to manage all session managers
+# Keep the session managers of all loaded servers, the cache warmer, the
+# snapshot writer, the shared store sweeper and the loop monitor running; save
+# a final snapshot on shutdown
 @contextlib.asynccontextmanager
 async def lifespan(app: FastAPI):
-    async with contextlib.AsyncExitStack() as stack:
-        await stack.enter_async_context(weather_mcp.session_manager.run())
-        await stack.enter_async_context(news_mcp.session_manager.run())
-        await stack.enter_async_context(currency_mcp.session_manager.run())
-        await stack.enter_async_context(quote_mcp.session_manager.run())
+    if snapshot is not None:
+        snapshot.open()
+        use_snapshot(snapshot)
+
+    async with registry.run(), anyio.create_task_group() as tg:
+        if settings.cache_warm_enabled:
+            tg.start_soon(warmer.run)
+        if snapshot is not None:
+            tg.start_soon(snapshot.run, settings.cache_snapshot_interval)
+        store = shared_store()
+        if store is not None:
+            tg.start_soon(store.run)
+        if diagnostics.enabled:
+            tg.start_soon(diagnostics.monitor.run)
         yield
+        tg.cancel_scope.cancel()
+
+    if snapshot is not None:
+        await anyio.to_thread.run_sync(snapshot.save)
+        snapshot.close()
 
 
 # Create FastAPI application
@@ -32,11 +87,37 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
-# Mount all MCP servers
-app.mount("/weather", weather_mcp.streamable_http_app())
-app.mount("/news", news_mcp.streamable_http_app())
-app.mount("/currency", currency_mcp.streamable_http_app())
-app.mount("/quotes", quote_mcp.streamable_http_app())
+# Compress large tool results (and plan results) for clients that accept it
+if settings.compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        encodings=settings.compression_encodings,
+        minimum_size=settings.compression_minimum_size,
+    )
+
+# Shed load on the MCP mounts before it piles up on the event loop (added
+# last, so it runs first)
+admission = AdmissionController(
+    {spec.path: spec.name for spec in registry.enabled},
+    max_concurrency=settings.admission_max_concurrency,
+    server_concurrency=settings.admission_server_concurrency,
+    queue_size=settings.admission_queue_size,
+    queue_timeout=settings.admission_queue_timeout,
+)
+if settings.admission_enabled:
+    app.add_middleware(AdmissionMiddleware, controller=admission)
+
+# Identify clients, enforce their quotas and count their usage (outermost, so
+# clients over quota never take an admission slot)
+if settings.usage_enabled:
+    app.add_middleware(
+        UsageMiddleware,
+        servers={spec.path: spec.name for spec in registry.enabled},
+        header=settings.client_id_header,
+    )
+
+# Mount all enabled MCP servers
+registry.mount(app)
 
 
 @app.get("/")
@@ -44,26 +125,97 @@ async def root():
     return {
         "message": "Multi-Server MCP Application",
         "servers": {
-            "weather": "/weather - Weather data and forecasts",
-            "news": "/news - Latest news and articles",
-            "currency": "/currency - Exchange rates and conversion",
-            "quotes": "/quotes - Inspirational quotes and facts",
+            spec.name: f"{spec.path} - {spec.description}" for spec in registry.enabled
         },
     }
 
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "servers": 5}
+    return {
+        "status": "healthy",
+        "servers": len(registry.enabled),
+        "loaded": registry.loaded,
+        "admission": admission.stats(),
+    }
+
+
+@app.post("/plan")
+async def run_plan(plan: Plan, request: Request):
+    """Run a dependency graph of tool calls across the mounted servers.
+
+    Steps are accounted, limited and admitted like calls to the MCP mounts,
+    and the whole plan honours the client's ``X-Request-Timeout``.
+    """
+    try:
+        with deadline_after(header_timeout(request.headers)):
+            result = await execute_plan(
+                plan,
+                registry,
+                client=identify(request.headers, settings.client_id_header),
+                usage=usage if settings.usage_enabled else None,
+                admission=admission if settings.admission_enabled else None,
+            )
+    except PlanError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return Response(content=dumps(result), media_type="application/json")
+
 
+def require_admin(authorization: Optional[str] = Header(None)) -> None:
+    """Admit requests bearing ADMIN_TOKEN; 404 while no token is configured"""
+    if not settings.admin_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    expected = f"Bearer {settings.admin_token}"
+    # Compare bytes: compare_digest rejects non-ASCII str with a TypeError
+    if authorization is None or not secrets.compare_digest(
+        authorization.encode(), expected.encode()
+    ):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+def require_diagnostics(authorization: Optional[str] = Header(None)) -> None:
+    """Like require_admin, and 404 while diagnostics are off"""
+    if not diagnostics.enabled:
+        raise HTTPException(status_code=404, detail="Not Found")
+    require_admin(authorization)
+
+
+@app.get(
+    "/admin/usage",
+    dependencies=[Depends(require_admin)],
+    include_in_schema=False,
+)
+async def get_usage():
+    """Tool calls and upstream requests per client since this worker started"""
+    return usage.report()
+
+
+@app.get(
+    "/admin/diagnostics",
+    dependencies=[Depends(require_diagnostics)],
+    include_in_schema=False,
+)
+async def get_diagnostics():
+    """Event loop lag, recent stalls and the slowest recent tool calls"""
+    return diagnostics.report()
+
+
+@app.get(
+    "/admin/diagnostics/profile",
+    dependencies=[Depends(require_diagnostics)],
+    include_in_schema=False,
+)
+async def get_profile(
+    seconds: float = Query(5.0, gt=0, le=60),
+    mode: Literal["sample", "cprofile"] = "sample",
+):
+    """Profile the event loop for ``seconds`` and return the result as text"""
+    if diagnostics.profiling:
+        raise HTTPException(status_code=409, detail="A profile is already running")
+    return PlainTextResponse(await diagnostics.profile(seconds, mode))
 
-# Configuration
-PORT = int(os.environ.get("PORT", 10000))
-HOST = os.environ.get("HOST", "0.0.0.0")
 
 if __name__ == "__main__":
-    import uvicorn
+    from utils import workers
 
-    uvicorn.run(
-        app, host=HOST, port=PORT, log_level=os.environ.get("LOG_LEVEL", "info")
-    )
+    workers.run(settings, [spec.name for spec in registry.enabled])
@@ -1,7 +1,16 @@
+"""Exchange rates and conversion"""
+
 from typing import List, Optional, Dict
-from mcp.server.fastmcp import FastMCP
+from utils.server import FastMCPServer
 from utils.api_clients import APIClient
+from utils.cache import cached
 from utils.config import settings
+from utils.models import (
+    Conversion,
+    ExchangeRates,
+    HistoricalRates,
+    SupportedCurrencies,
+)
 
 # Initialize currency API client
 currency_client = APIClient(
@@ -10,11 +19,14 @@ currency_client = APIClient(
 )
 
 # Create MCP server
-mcp = FastMCP(name="currency-server", stateless_http=True)
+mcp = FastMCPServer(
+    name="currency-server", stateless_http=True, clients=[currency_client]
+)
 
 
 @mcp.tool()
-async def get_exchange_rates(base_currency: str = "USD") -> dict:
+@cached(ttl=3600)
+async def get_exchange_rates(base_currency: str = "USD") -> ExchangeRates:
     """
     Get current exchange rates for a base currency.
 
@@ -26,15 +38,12 @@ async def get_exchange_rates(base_currency: str = "USD") -> dict:
         raise ValueError("Exchange Rates API key not configured")
 
     try:
-        data = await currency_client.get(f"/{api_key}/latest/{base_currency.upper()}")
+        data = await currency_client.get(
+            f"/{api_key}/latest/{base_currency.upper()}", name="/latest"
+        )
 
         if data["result"] == "success":
-            return {
-                "base_currency": data["base_code"],
-                "last_updated": data["time_last_update_utc"],
-                "next_update": data["time_next_update_utc"],
-                "exchange_rates": data["conversion_rates"],
-            }
+            return ExchangeRates.from_api(data)
         else:
             raise Exception(f"API Error: {data.get('error-type', 'Unknown error')}")
 
@@ -43,7 +52,9 @@ async def get_exchange_rates(base_currency: str = "USD") -> dict:
 
 
 @mcp.tool()
-async def convert_currency(from_currency: str, to_currency: str, amount: float) -> dict:
+async def convert_currency(
+    from_currency: str, to_currency: str, amount: float
+) -> Conversion:
     """
     Convert amount from one currency to another.
 
@@ -58,18 +69,12 @@ async def convert_currency(from_currency: str, to_currency: str, amount: float)
 
     try:
         data = await currency_client.get(
-            f"/{api_key}/pair/{from_currency.upper()}/{to_currency.upper()}/{amount}"
+            f"/{api_key}/pair/{from_currency.upper()}/{to_currency.upper()}/{amount}",
+            name="/pair",
         )
 
         if data["result"] == "success":
-            return {
-                "from_currency": data["base_code"],
-                "to_currency": data["target_code"],
-                "exchange_rate": data["conversion_rate"],
-                "original_amount": amount,
-                "converted_amount": data["conversion_result"],
-                "last_updated": data["time_last_update_utc"],
-            }
+            return Conversion.from_api(data, amount)
         else:
             raise Exception(f"API Error: {data.get('error-type', 'Unknown error')}")
 
@@ -78,7 +83,8 @@ async def convert_currency(from_currency: str, to_currency: str, amount: float)
 
 
 @mcp.tool()
-async def get_supported_currencies() -> dict:
+@cached(ttl=86400)
+async def get_supported_currencies() -> SupportedCurrencies:
     """
     Get list of all supported currencies.
     """
@@ -87,14 +93,10 @@ async def get_supported_currencies() -> dict:
         raise ValueError("Exchange Rates API key not configured")
 
     try:
-        data = await currency_client.get(f"/{api_key}/codes")
+        data = await currency_client.get(f"/{api_key}/codes", name="/codes")
 
         if data["result"] == "success":
-            currencies = {}
-            for code_pair in data["supported_codes"]:
-                currencies[code_pair[0]] = code_pair[1]
-
-            return {"total_currencies": len(currencies), "currencies": currencies}
+            return SupportedCurrencies.from_api(data)
         else:
             raise Exception(f"API Error: {data.get('error-type', 'Unknown error')}")
 
@@ -105,7 +107,7 @@ async def get_supported_currencies() -> dict:
 @mcp.tool()
 async def get_historical_rates(
     base_currency: str, target_currency: str, date: str
-) -> dict:
+) -> HistoricalRates:
     """
     Get historical exchange rates for a specific date.
 
@@ -125,21 +127,11 @@ async def get_historical_rates(
         datetime.strptime(date, "%Y-%m-%d")
 
         data = await currency_client.get(
-            f"/{api_key}/history/{base_currency.upper()}/{date}"
+            f"/{api_key}/history/{base_currency.upper()}/{date}", name="/history"
         )
 
         if data["result"] == "success":
-            target_rate = data["conversion_rates"].get(target_currency.upper())
-
-            return {
-                "base_currency": data["base_code"],
-                "target_currency": target_currency.upper(),
-                "date": date,
-                "exchange_rate": target_rate,
-                "all_rates": data["conversion_rates"]
-                if target_currency.upper() == "ALL"
-                else None,
-            }
+            return HistoricalRates.from_api(data, target_currency.upper(), date)
         else:
             raise Exception(f"API Error: {data.get('error-type', 'Unknown error')}")
 
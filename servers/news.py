@@ -1,7 +1,11 @@
+"""Latest news and articles"""
+
 from typing import List, Optional
-from mcp.server.fastmcp import FastMCP
+from utils.server import FastMCPServer
 from utils.api_clients import APIClient
+from utils.cache import cached
 from utils.config import settings
+from utils.models import Headlines, NewsSearch
 
 # Initialize news API client
 news_client = APIClient(
@@ -10,13 +14,16 @@ news_client = APIClient(
 )
 
 # Create MCP server
-mcp = FastMCP(name="news-server", stateless_http=True)
+mcp = FastMCPServer(
+    name="news-server", stateless_http=True, clients=[news_client]
+)
 
 
 @mcp.tool()
+@cached(ttl=300)
 async def get_top_headlines(
     country: str = "us", category: Optional[str] = None, page_size: int = 10
-) -> dict:
+) -> Headlines:
     """
     Get top news headlines.
 
@@ -36,27 +43,7 @@ async def get_top_headlines(
 
     try:
         data = await news_client.get("/top-headlines", params=params)
-        articles = []
-
-        for article in data["articles"]:
-            articles.append(
-                {
-                    "title": article["title"],
-                    "description": article["description"],
-                    "url": article["url"],
-                    "source": article["source"]["name"],
-                    "author": article.get("author"),
-                    "published_at": article["publishedAt"],
-                    "url_to_image": article.get("urlToImage"),
-                }
-            )
-
-        return {
-            "total_results": data["totalResults"],
-            "articles": articles,
-            "country": country,
-            "category": category,
-        }
+        return Headlines.from_api(data, country, category)
     except Exception as e:
         raise Exception(f"Failed to get top headlines: {str(e)}")
 
@@ -64,7 +51,7 @@ async def get_top_headlines(
 @mcp.tool()
 async def search_news(
     query: str, sort_by: str = "publishedAt", language: str = "en", page_size: int = 10
-) -> dict:
+) -> NewsSearch:
     """
     Search for news articles by keyword.
 
@@ -88,28 +75,7 @@ async def search_news(
 
     try:
         data = await news_client.get("/everything", params=params)
-        articles = []
-
-        for article in data["articles"]:
-            articles.append(
-                {
-                    "title": article["title"],
-                    "description": article["description"],
-                    "url": article["url"],
-                    "source": article["source"]["name"],
-                    "author": article.get("author"),
-                    "published_at": article["publishedAt"],
-                    "url_to_image": article.get("urlToImage"),
-                }
-            )
-
-        return {
-            "total_results": data["totalResults"],
-            "articles": articles,
-            "query": query,
-            "sort_by": sort_by,
-            "language": language,
-        }
+        return NewsSearch.from_api(data, query, sort_by, language)
     except Exception as e:
         raise Exception(f"Failed to search news: {str(e)}")
 
@@ -117,7 +83,7 @@ async def search_news(
 @mcp.tool()
 async def get_news_by_category(
     category: str, country: str = "us", page_size: int = 10
-) -> dict:
+) -> Headlines:
     """
     Get news articles by specific category.
 
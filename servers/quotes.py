@@ -1,7 +1,18 @@
+"""Inspirational quotes and facts"""
+
 import random
 from typing import List, Optional
-from mcp.server.fastmcp import FastMCP
+from utils.server import FastMCPServer
 from utils.api_clients import APIClient, retry_on_failure
+from utils.cache import cached
+from utils.models import (
+    Fact,
+    Quote,
+    QuoteCategories,
+    QuotesByAuthor,
+    QuotesByCategory,
+    QuoteSearch,
+)
 
 # Initialize quote API clients
 quote_client = APIClient(
@@ -15,7 +26,9 @@ fact_client = APIClient(
 )
 
 # Create MCP server
-mcp = FastMCP(name="quote-server", stateless_http=True)
+mcp = FastMCPServer(
+    name="quote-server", stateless_http=True, clients=[quote_client, fact_client]
+)
 
 
 @mcp.tool()
@@ -23,7 +36,7 @@ async def get_random_quote(
     min_length: Optional[int] = None,
     max_length: Optional[int] = None,
     tags: Optional[str] = None,
-) -> dict:
+) -> Quote:
     """
     Get a random inspirational quote.
 
@@ -43,19 +56,15 @@ async def get_random_quote(
 
     try:
         data = await quote_client.get("/random", params=params)
-
-        return {
-            "quote": data["content"],
-            "author": data["author"],
-            "length": data["length"],
-            "tags": data["tags"],
-        }
+        return Quote.from_api(data)
     except Exception as e:
         raise Exception(f"Failed to get random quote: {str(e)}")
 
 
 @mcp.tool()
-async def get_quote_by_category(category: str, limit: int = 10) -> dict:
+async def get_quote_by_category(
+    category: str, limit: int = 10
+) -> QuotesByCategory:
     """
     Get quotes by specific category/tag.
 
@@ -68,28 +77,13 @@ async def get_quote_by_category(category: str, limit: int = 10) -> dict:
     try:
         data = await quote_client.get("/quotes", params=params)
 
-        quotes = []
-        for quote in data["results"]:
-            quotes.append(
-                {
-                    "quote": quote["content"],
-                    "author": quote["author"],
-                    "length": quote["length"],
-                    "tags": quote["tags"],
-                }
-            )
-
-        return {
-            "category": category,
-            "total_quotes": data["totalCount"],
-            "quotes": quotes,
-        }
+        return QuotesByCategory.from_api(data, category)
     except Exception as e:
         raise Exception(f"Failed to get quotes by category: {str(e)}")
 
 
 @mcp.tool()
-async def get_quote_by_author(author: str, limit: int = 10) -> dict:
+async def get_quote_by_author(author: str, limit: int = 10) -> QuotesByAuthor:
     """
     Get quotes by a specific author.
 
@@ -102,63 +96,38 @@ async def get_quote_by_author(author: str, limit: int = 10) -> dict:
     try:
         data = await quote_client.get("/quotes", params=params)
 
-        quotes = []
-        for quote in data["results"]:
-            quotes.append(
-                {
-                    "quote": quote["content"],
-                    "author": quote["author"],
-                    "length": quote["length"],
-                    "tags": quote["tags"],
-                }
-            )
-
-        return {"author": author, "total_quotes": data["totalCount"], "quotes": quotes}
+        return QuotesByAuthor.from_api(data, author)
     except Exception as e:
         raise Exception(f"Failed to get quotes by author: {str(e)}")
 
 
 @mcp.tool()
-async def get_random_fact() -> dict:
+async def get_random_fact() -> Fact:
     """
     Get a random interesting fact.
     """
     try:
         data = await fact_client.get("/api/v2/facts/random")
-
-        return {
-            "fact": data["text"],
-            "source": data.get("source", "Unknown"),
-            "language": "en",
-        }
+        return Fact.from_api(data)
     except Exception as e:
         raise Exception(f"Failed to get random fact: {str(e)}")
 
 
 @mcp.tool()
-async def get_quote_categories() -> dict:
+@cached(ttl=86400)
+async def get_quote_categories() -> QuoteCategories:
     """
     Get available quote categories/tags.
     """
     try:
         data = await quote_client.get("/tags")
-
-        categories = []
-        for tag in data:
-            categories.append({"name": tag["name"], "quote_count": tag["quoteCount"]})
-
-        return {
-            "total_categories": len(categories),
-            "categories": sorted(
-                categories, key=lambda x: x["quote_count"], reverse=True
-            ),
-        }
+        return QuoteCategories.from_api(data)
     except Exception as e:
         raise Exception(f"Failed to get quote categories: {str(e)}")
 
 
 @mcp.tool()
-async def search_quotes(query: str, limit: int = 10) -> dict:
+async def search_quotes(query: str, limit: int = 10) -> QuoteSearch:
     """
     Search for quotes containing specific keywords.
 
@@ -171,17 +140,6 @@ async def search_quotes(query: str, limit: int = 10) -> dict:
     try:
         data = await quote_client.get("/search/quotes", params=params)
 
-        quotes = []
-        for quote in data["results"]:
-            quotes.append(
-                {
-                    "quote": quote["content"],
-                    "author": quote["author"],
-                    "length": quote["length"],
-                    "tags": quote["tags"],
-                }
-            )
-
-        return {"query": query, "total_results": data["totalCount"], "quotes": quotes}
+        return QuoteSearch.from_api(data, query)
     except Exception as e:
         raise Exception(f"Failed to search quotes: {str(e)}")
@@ -1,7 +1,12 @@
-from typing import Optional
-from mcp.server.fastmcp import FastMCP
+"""Weather data and forecasts"""
+
+from typing import Any, Dict, Optional
+from utils.server import FastMCPServer
 from utils.api_clients import APIClient
+from utils.cache import cached
 from utils.config import settings
+from utils.gazetteer import Gazetteer
+from utils.models import CurrentWeather, Forecast, WeatherAtCoordinates
 
 # Initialize weather API client
 weather_client = APIClient(
@@ -10,18 +15,33 @@ weather_client = APIClient(
 )
 
 # Create MCP server
-mcp = FastMCP(name="weather-server", stateless_http=True)
+mcp = FastMCPServer(
+    name="weather-server", stateless_http=True, clients=[weather_client]
+)
+
+# Resolves aliases and misspellings ("NYC", "new york, us", "Lodon") to one
+# canonical city and country before anything is fetched or cached
+gazetteer = Gazetteer.from_csv()
+
+
+def canonical_location(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Arguments with the city and country code replaced by canonical ones"""
+    city, country_code = gazetteer.canonical(
+        arguments["city"], arguments.get("country_code")
+    )
+    return {**arguments, "city": city, "country_code": country_code}
 
 
 @mcp.tool()
+@cached(ttl=600, normalize=canonical_location)
 async def get_current_weather(
     city: str, country_code: Optional[str] = None, units: str = "metric"
-) -> dict:
+) -> CurrentWeather:
     """
     Get current weather for a specific city.
 
     Args:
-        city: Name of the city
+        city: Name of the city, e.g. "London", "NYC" or "new york, us"
         country_code: Optional ISO 3166 country code (e.g., 'US', 'GB')
         units: Temperature units ('metric', 'imperial', 'kelvin')
     """
@@ -34,18 +54,7 @@ async def get_current_weather(
 
     try:
         data = await weather_client.get("/weather", params=params)
-        return {
-            "city": data["name"],
-            "country": data["sys"]["country"],
-            "temperature": data["main"]["temp"],
-            "feels_like": data["main"]["feels_like"],
-            "humidity": data["main"]["humidity"],
-            "pressure": data["main"]["pressure"],
-            "description": data["weather"][0]["description"],
-            "wind_speed": data["wind"]["speed"],
-            "visibility": data.get("visibility", "N/A"),
-            "units": units,
-        }
+        return CurrentWeather.from_api(data, units)
     except Exception as e:
         raise Exception(f"Failed to get weather data: {str(e)}")
 
@@ -53,12 +62,12 @@ async def get_current_weather(
 @mcp.tool()
 async def get_weather_forecast(
     city: str, days: int = 5, country_code: Optional[str] = None, units: str = "metric"
-) -> dict:
+) -> Forecast:
     """
     Get weather forecast for a specific city.
 
     Args:
-        city: Name of the city
+        city: Name of the city, e.g. "London", "NYC" or "new york, us"
         days: Number of days for forecast (1-5)
         country_code: Optional ISO 3166 country code
         units: Temperature units ('metric', 'imperial', 'kelvin')
@@ -67,6 +76,7 @@ async def get_weather_forecast(
     if not api_key:
         raise ValueError("OpenWeatherMap API key not configured")
 
+    city, country_code = gazetteer.canonical(city, country_code)
     location = f"{city},{country_code}" if country_code else city
     params = {
         "q": location,
@@ -77,25 +87,7 @@ async def get_weather_forecast(
 
     try:
         data = await weather_client.get("/forecast", params=params)
-        forecasts = []
-
-        for item in data["list"][: days * 8]:
-            forecasts.append(
-                {
-                    "datetime": item["dt_txt"],
-                    "temperature": item["main"]["temp"],
-                    "description": item["weather"][0]["description"],
-                    "humidity": item["main"]["humidity"],
-                    "wind_speed": item["wind"]["speed"],
-                }
-            )
-
-        return {
-            "city": data["city"]["name"],
-            "country": data["city"]["country"],
-            "forecasts": forecasts,
-            "units": units,
-        }
+        return Forecast.from_api(data, units, limit=days * 8)
     except Exception as e:
         raise Exception(f"Failed to get weather forecast: {str(e)}")
 
@@ -103,7 +95,7 @@ async def get_weather_forecast(
 @mcp.tool()
 async def get_weather_by_coordinates(
     lat: float, lon: float, units: str = "metric"
-) -> dict:
+) -> WeatherAtCoordinates:
     """
     Get current weather by geographical coordinates.
 
@@ -120,15 +112,6 @@ async def get_weather_by_coordinates(
 
     try:
         data = await weather_client.get("/weather", params=params)
-        return {
-            "location": f"{data['name']}, {data['sys']['country']}",
-            "coordinates": {"lat": lat, "lon": lon},
-            "temperature": data["main"]["temp"],
-            "feels_like": data["main"]["feels_like"],
-            "humidity": data["main"]["humidity"],
-            "description": data["weather"][0]["description"],
-            "wind_speed": data["wind"]["speed"],
-            "units": units,
-        }
+        return WeatherAtCoordinates.from_api(data, lat, lon, units)
     except Exception as e:
         raise Exception(f"Failed to get weather by coordinates: {str(e)}")
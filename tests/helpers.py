@@ -0,0 +1,45 @@
+import asyncio
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Mount, Route
+from utils.deadline import remaining
+from utils.usage import current_client
+
+
+def mcp_app(*servers):
+    """MCP-like endpoints at ``/<server>/mcp/``; "slow" waits for ``release``.
+
+    Each call answers with its id, the time left before its deadline and the
+    client it is accounted to.
+    """
+    release = asyncio.Event()
+
+    async def tool_call(request):
+        body = await request.json()
+        if body["params"]["name"] == "slow":
+            await release.wait()
+        return JSONResponse(
+            {
+                "id": body["id"],
+                "remaining": remaining(),
+                "client": current_client.get(),
+            }
+        )
+
+    app = Starlette(
+        routes=[
+            Mount(f"/{server}", routes=[Route("/mcp/", tool_call, methods=["POST"])])
+            for server in servers
+        ]
+    )
+    return app, release
+
+
+def call(name, arguments=None, id=1):
+    """A JSON-RPC tools/call request"""
+    return {
+        "jsonrpc": "2.0",
+        "id": id,
+        "method": "tools/call",
+        "params": {"name": name, "arguments": arguments or {}},
+    }
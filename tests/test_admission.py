@@ -0,0 +1,116 @@
+import asyncio
+import httpx
+import pytest
+from utils.admission import AdmissionController, AdmissionMiddleware, Limiter
+from utils.api_clients import APIClient
+from utils.cache import CACHES, TTLCache
+from utils.deadline import DeadlineExceeded, deadline_after
+from tests.helpers import call, mcp_app
+
+
+def make_app(**limits):
+    controller = AdmissionController({"/weather": "weather"}, **limits)
+    inner, release = mcp_app("weather")
+    return controller, AdmissionMiddleware(inner, controller), release
+
+
+@pytest.mark.asyncio
+async def test_limiter_queue_is_bounded_and_fifo():
+    limiter = Limiter(limit=1, queue_size=1)
+    assert await limiter.acquire(0)
+
+    waiter = asyncio.create_task(limiter.acquire(1))
+    await asyncio.sleep(0)
+    assert limiter.waiting == 1
+    # The queue is full: no waiting at all
+    assert not await limiter.acquire(1)
+
+    limiter.release()
+    assert await waiter
+    assert limiter.active == 1
+
+
+@pytest.mark.asyncio
+async def test_overload_is_rejected_fast():
+    controller, app, release = make_app(server_concurrency=1, queue_size=0)
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        slow = asyncio.create_task(client.post("/weather/mcp/", json=call("slow")))
+        await asyncio.sleep(0.05)
+        shed = await client.post("/weather/mcp/", json=call("other", id=7))
+        release.set()
+        assert (await slow).status_code == 200
+
+    assert shed.status_code == 503
+    assert shed.headers["retry-after"] == "1"
+    assert shed.json()["id"] == 7
+    assert shed.json()["error"]["code"] == -32000
+    assert controller.stats()["shed"] == 1
+    assert controller.stats()["servers"]["weather"]["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cache_hits_skip_the_queue():
+    cache = TTLCache("cached_tool", ttl=60)
+    key, arguments = cache.key_for({"city": "Rome"})
+    cache.set(key, {"city": "Rome"}, arguments)
+    _, app, release = make_app(server_concurrency=1, queue_size=0)
+
+    try:
+        CACHES["cached_tool"] = cache
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            slow = asyncio.create_task(client.post("/weather/mcp/", json=call("slow")))
+            await asyncio.sleep(0.05)
+            hit = await client.post(
+                "/weather/mcp/", json=call("cached_tool", {"city": "Rome"})
+            )
+            miss = await client.post(
+                "/weather/mcp/", json=call("cached_tool", {"city": "Oslo"})
+            )
+            release.set()
+            await slow
+    finally:
+        del CACHES["cached_tool"]
+
+    assert hit.status_code == 200
+    assert miss.status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_deadline_is_propagated():
+    controller, app, _ = make_app()
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        response = await client.post(
+            "/weather/mcp/", json=call("fast"), headers={"X-Request-Timeout": "5"}
+        )
+        expired = await client.post(
+            "/weather/mcp/", json=call("fast"), headers={"X-Request-Timeout": "0"}
+        )
+
+    assert 4 < response.json()["remaining"] <= 5
+    assert expired.status_code == 504
+    assert controller.stats()["expired"] == 1
+
+
+@pytest.mark.asyncio
+async def test_upstream_calls_respect_the_deadline():
+    requests = []
+
+    async def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={})
+
+    client = APIClient(
+        "https://api.example.com", transport=httpx.MockTransport(handler)
+    )
+    with deadline_after(0):
+        with pytest.raises(DeadlineExceeded):
+            await client.get("/weather")
+
+    assert requests == []
+    await client.aclose()
@@ -0,0 +1,109 @@
+import asyncio
+import httpx
+import pytest
+from utils.api_clients import APIClient
+from utils.latency import LatencyTracker
+from utils.usage import UsageTracker, current_client
+
+
+def test_adaptive_timeout():
+    tracker = LatencyTracker(min_samples=10, default_timeout=5.0, min_timeout=0.5)
+
+    for _ in range(9):
+        tracker.record("/random", 0.2)
+    assert tracker.timeout("/random") == 5.0
+
+    tracker.record("/random", 0.4)
+    assert tracker.timeout("/random") == pytest.approx(0.8)
+    assert tracker.hedge_delay("/random") == pytest.approx(0.4)
+    assert tracker.timeout("/other") == 5.0
+
+
+@pytest.mark.asyncio
+async def test_get_records_latency():
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json={"ok": 1}))
+    client = APIClient(base_url="https://api.example.com", transport=transport)
+
+    assert await client.get("/quotes", params={"limit": 1}) == {"ok": 1}
+    assert await client.get("/v6/secret/latest/USD", name="/latest") == {"ok": 1}
+
+    assert client.latency.count("/quotes") == 1
+    assert client.latency.count("/latest") == 1
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_hedged_get_returns_faster_attempt():
+    attempts = []
+
+    async def handler(request):
+        attempts.append(request)
+        # The first attempt stalls, the hedge answers immediately
+        if len(attempts) == 1:
+            await asyncio.sleep(1.0)
+            return httpx.Response(200, json={"attempt": 1})
+        return httpx.Response(200, json={"attempt": 2})
+
+    client = APIClient(
+        base_url="https://api.example.com",
+        transport=httpx.MockTransport(handler),
+        hedging=True,
+    )
+    for _ in range(client.latency.min_samples):
+        client.latency.record("/random", 0.01)
+        client.latency.count_request()
+
+    result = await asyncio.wait_for(client.get("/random"), timeout=0.5)
+
+    assert result == {"attempt": 2}
+    assert len(attempts) == 2
+    # The cancelled first attempt still counts, as the slowest sample
+    assert client.latency.count("/random") == client.latency.min_samples + 2
+    assert client.latency.percentile("/random", 1.0) > 0.01
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_hedges_are_charged_to_the_client(monkeypatch):
+    tracker = UsageTracker({"agent": {"api.example.com": 1}})
+    monkeypatch.setattr("utils.api_clients.usage", tracker)
+    attempts = []
+
+    async def handler(request):
+        attempts.append(request)
+        await asyncio.sleep(0.1)
+        return httpx.Response(200, json={"attempt": len(attempts)})
+
+    client = APIClient(
+        base_url="https://api.example.com",
+        transport=httpx.MockTransport(handler),
+        hedging=True,
+    )
+    for _ in range(client.latency.min_samples):
+        client.latency.record("/random", 0.01)
+        client.latency.count_request()
+
+    token = current_client.set("agent")
+    try:
+        # The quota has no room for a backup, so the primary is awaited
+        assert await client.get("/random") == {"attempt": 1}
+    finally:
+        current_client.reset(token)
+        await client.aclose()
+
+    assert len(attempts) == 1
+    agent = tracker.report()["clients"]["agent"]
+    assert agent["upstream"] == {"api.example.com": 1}
+    assert agent["rejected"] == {"api.example.com": 1}
+
+
+def test_hedges_follow_recent_traffic():
+    tracker = LatencyTracker(hedge_ratio=0.25, hedge_burst=2.0)
+    for _ in range(10_000):
+        tracker.count_request()
+
+    # A long quiet history only banks the burst, not 1000 hedges
+    assert [tracker.take_hedge() for _ in range(3)] == [True, True, False]
+    for _ in range(4):
+        tracker.count_request()
+    assert tracker.take_hedge()
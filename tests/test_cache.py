@@ -0,0 +1,155 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+from utils.cache import MISSING, TTLCache, cached
+from utils.models import Quote
+from utils.shared_state import SharedStore
+from utils.warmers import CacheWarmer
+
+
+def make_tool(ttl=60.0):
+    calls = []
+
+    @cached(ttl=ttl)
+    async def lookup(city: str, units: str = "metric") -> dict:
+        calls.append((city, units))
+        await asyncio.sleep(0.01)
+        if city == "Nowhere":
+            raise ValueError("city not found")
+        return {"city": city, "units": units}
+
+    return lookup, calls
+
+
+@pytest.mark.asyncio
+async def test_cached_by_canonical_arguments():
+    lookup, calls = make_tool()
+
+    first = await lookup("London")
+    second = await lookup(city="London", units="metric")
+
+    assert first is second
+    assert calls == [("London", "metric")]
+
+    await lookup("London", units="imperial")
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_call():
+    lookup, calls = make_tool()
+
+    results = await asyncio.gather(*(lookup("Paris") for _ in range(5)))
+
+    assert calls == [("Paris", "metric")]
+    assert all(result is results[0] for result in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_waiters():
+    lookup, calls = make_tool()
+
+    leader = asyncio.create_task(lookup("Paris"))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(lookup("Paris"))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == {"city": "Paris", "units": "metric"}
+    assert leader.cancelled()
+    assert calls == [("Paris", "metric")]
+
+
+@pytest.mark.asyncio
+async def test_errors_are_not_cached():
+    lookup, calls = make_tool()
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            await lookup("Nowhere")
+
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_expiry():
+    lookup, calls = make_tool(ttl=0.01)
+
+    await lookup("Oslo")
+    await asyncio.sleep(0.02)
+    await lookup("Oslo")
+
+    assert len(calls) == 2
+
+
+def test_lru_eviction():
+    cache = TTLCache("test", ttl=60, maxsize=2)
+    for key in ("a", "b", "c"):
+        cache.set(key, key.upper(), {})
+
+    assert [key for key, _, _ in cache.items()] == ["b", "c"]
+
+
+def test_entries_shared_between_workers_as_json(tmp_path):
+    store = SharedStore(str(tmp_path / "state.sqlite"))
+    first, second = TTLCache("quotes", ttl=60), TTLCache("quotes", ttl=60)
+    quote = Quote(quote="Stay hungry.", author="Steve Jobs", length=12, tags=[])
+
+    with patch("utils.cache.shared_store", return_value=store):
+        first.set("random", quote, {})
+        shared = second.get("random")
+
+    assert shared == quote.to_dict()
+    assert TTLCache("quotes", ttl=60).get("random") is MISSING
+
+
+@pytest.mark.asyncio
+async def test_warmer_refreshes_hot_keys_within_budget():
+    lookup, calls = make_tool(ttl=10)
+    cache = lookup.cache
+    for city in ("Rome", "Rome", "Rome", "Lima", "Lima", "Kyiv"):
+        await lookup(city)
+    calls.clear()
+
+    warmer = CacheWarmer(
+        ["lookup"],
+        top_k=2,
+        lead_time=60,
+        budget=1,
+        static_keys={"lookup": [{"city": "Cairo"}]},
+        caches={"lookup": cache},
+    )
+    assert await warmer.tick() == 1
+    assert calls == [("Cairo", "metric")]
+
+    warmer.budget = 10
+    assert await warmer.tick() == 3
+    # The configured key and the two hottest learned keys, never the cold one
+    assert [city for city, _ in calls[1:]] == ["Cairo", "Rome", "Lima"]
+
+
+@pytest.mark.asyncio
+async def test_workers_refresh_a_shared_key_once(tmp_path):
+    store = SharedStore(str(tmp_path / "state.sqlite"))
+    workers = []
+    for _ in range(2):
+        lookup, calls = make_tool(ttl=10)
+        warmer = CacheWarmer(
+            ["lookup"],
+            lead_time=5,
+            static_keys={"lookup": [{"city": "Rome"}]},
+            caches={"lookup": lookup.cache},
+        )
+        workers.append((warmer, lookup.cache, calls))
+    (first, first_cache, first_calls), (second, second_cache, second_calls) = workers
+
+    with patch("utils.cache.shared_store", return_value=store), patch(
+        "utils.warmers.shared_store", return_value=store
+    ):
+        assert await first.tick() == 1
+        # The second worker picks up the entry the first one refreshed
+        assert await second.tick() == 0
+
+    key, _ = second_cache.key_for({"city": "Rome"})
+    assert second_cache.expires_in(key) > 5
+    assert len(first_calls) + len(second_calls) == 1
@@ -0,0 +1,174 @@
+import asyncio
+import zlib
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+from utils.compression import CompressionMiddleware, choose_encoding
+
+RATES = {"conversion_rates": {f"C{i:03d}": i * 1.5 for i in range(200)}}
+
+
+async def rates(request):
+    return JSONResponse(RATES)
+
+
+async def small(request):
+    return JSONResponse({"ok": True})
+
+
+first_event = asyncio.Event()
+
+
+async def idle(request):
+    async def stream():
+        await first_event.wait()
+        yield b"event: message\r\ndata: hi\r\n\r\n"
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
+
+async def events(request):
+    async def stream():
+        yield b"event: message\r\ndata: " + b"x" * 2000 + b"\r\n\r\n"
+        yield b"event: message\r\ndata: done\r\n\r\n"
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
+
+async def result(request):
+    async def stream():
+        yield b"event: message\r\ndata: {}\r\n\r\n"
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
+
+app = CompressionMiddleware(
+    Starlette(
+        routes=[
+            Route("/rates", rates),
+            Route("/small", small),
+            Route("/sse", events, methods=["GET", "POST"]),
+            Route("/result", result, methods=["POST"]),
+            Route("/idle", idle),
+        ]
+    ),
+    encodings=["gzip"],
+    minimum_size=1024,
+)
+
+
+@pytest.mark.asyncio
+async def test_compresses_large_json():
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        response = await client.get("/rates", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.json() == RATES
+
+
+@pytest.mark.asyncio
+async def test_skips_small_or_unaccepted_responses():
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        small_response = await client.get("/small", headers={"Accept-Encoding": "gzip"})
+        identity = await client.get("/rates", headers={"Accept-Encoding": "identity"})
+
+    assert "content-encoding" not in small_response.headers
+    assert "content-encoding" not in identity.headers
+    assert identity.json() == RATES
+
+
+def fake_receive():
+    """An ASGI receive that sends an empty request, then waits for disconnect"""
+    requests = [{"type": "http.request", "body": b"", "more_body": False}]
+    disconnect = asyncio.Event()
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        await disconnect.wait()
+        return {"type": "http.disconnect"}
+
+    return receive, disconnect
+
+
+def sse_scope(path, method="GET"):
+    return {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "headers": [(b"accept-encoding", b"gzip")],
+        "query_string": b"",
+    }
+
+
+@pytest.mark.asyncio
+async def test_streamed_events_decode_as_they_arrive():
+    messages = []
+    receive, disconnect = fake_receive()
+
+    async def send(message):
+        messages.append(message)
+
+    await app(sse_scope("/sse"), receive, send)
+    disconnect.set()
+
+    start, first, second, last = messages
+    assert (b"content-encoding", b"gzip") in start["headers"]
+    decoder = zlib.decompressobj(31)
+    assert decoder.decompress(first["body"]).endswith(b"x" * 2000 + b"\r\n\r\n")
+    assert decoder.decompress(second["body"]) == b"event: message\r\ndata: done\r\n\r\n"
+    assert last["more_body"] is False
+
+
+def test_choose_encoding():
+    assert choose_encoding("gzip, deflate", ["zstd", "gzip"]) == "gzip"
+    assert choose_encoding("gzip;q=0, *", ["gzip"]) is None
+    assert choose_encoding("", ["gzip"]) is None
+
+
+@pytest.mark.asyncio
+async def test_sse_headers_are_not_held_back():
+    messages = []
+    receive, disconnect = fake_receive()
+
+    async def send(message):
+        messages.append(message)
+
+    task = asyncio.create_task(app(sse_scope("/idle"), receive, send))
+    await asyncio.sleep(0.05)
+
+    assert [m["type"] for m in messages] == ["http.response.start"]
+    first_event.set()
+    await task
+    disconnect.set()
+
+    decoder = zlib.decompressobj(31)
+    body = b"".join(decoder.decompress(m.get("body", b"")) for m in messages[1:])
+    assert body == b"event: message\r\ndata: hi\r\n\r\n"
+
+
+@pytest.mark.asyncio
+async def test_sse_results_below_minimum_size_are_not_compressed():
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    for path in ["/result", "/sse"]:
+        receive, disconnect = fake_receive()
+        await app(sse_scope(path, "POST"), receive, send)
+        disconnect.set()
+
+    small_start, large_start = [
+        m for m in messages if m["type"] == "http.response.start"
+    ]
+    assert b"content-encoding" not in dict(small_start["headers"])
+    assert (b"content-encoding", b"gzip") in large_start["headers"]
+    assert messages[1]["body"] == b"event: message\r\ndata: {}\r\n\r\n"
@@ -0,0 +1,84 @@
+import asyncio
+import time
+import httpx
+import pytest
+from utils.api_clients import APIClient
+from utils.diagnostics import Diagnostics, LoopMonitor
+from utils.server import FastMCPServer
+
+
+def blocking_callback():
+    time.sleep(0.3)
+
+
+@pytest.mark.asyncio
+async def test_stall_is_attributed_to_the_blocking_callback():
+    monitor = LoopMonitor(interval=0.02, stall_threshold=0.1)
+    task = asyncio.create_task(monitor.run())
+    await asyncio.sleep(0.05)
+    blocking_callback()
+    await asyncio.sleep(0.05)
+    task.cancel()
+
+    stats = monitor.stats()
+    assert stats["stalls"] == 1
+    assert stats["max_lag_ms"] >= 200
+    stack = stats["recent_stalls"][0]["stack"]
+    assert any(frame.startswith("blocking_callback ") for frame in stack)
+
+
+@pytest.mark.asyncio
+async def test_slow_tool_calls_are_kept_with_a_breakdown(monkeypatch):
+    diagnostics = Diagnostics(enabled=True, slow_call_threshold=0.05, slow_calls=2)
+    monkeypatch.setattr("utils.server.diagnostics", diagnostics)
+    monkeypatch.setattr("utils.api_clients.diagnostics", diagnostics)
+
+    async def handler(request):
+        await asyncio.sleep(0.1)
+        return httpx.Response(200, json={"temp": 21})
+
+    client = APIClient(
+        "https://api.example.com", transport=httpx.MockTransport(handler)
+    )
+    mcp = FastMCPServer(name="diag-server", clients=[client])
+
+    @mcp.tool()
+    async def lookup(city: str) -> dict:
+        return await client.get("/weather", params={"q": city})
+
+    @mcp.tool()
+    async def fast() -> dict:
+        return {}
+
+    await mcp.call_tool("lookup", {"city": "Oslo"})
+    await mcp.call_tool("fast", {})
+    await client.aclose()
+
+    (call,) = diagnostics.report()["slow_calls"]
+    assert call["tool"] == "lookup" and call["arguments"] == {"city": "Oslo"}
+    assert call["upstream_requests"] == 1
+    assert 100 <= call["upstream_ms"] <= call["total_ms"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["sample", "cprofile"])
+async def test_profile_shows_busy_code(mode):
+    diagnostics = Diagnostics(enabled=True)
+
+    def spin():
+        end = time.perf_counter() + 0.05
+        while time.perf_counter() < end:
+            pass
+
+    async def busy():
+        while True:
+            spin()
+            await asyncio.sleep(0)
+
+    task = asyncio.create_task(busy())
+    try:
+        profile = await diagnostics.profile(0.3, mode)
+    finally:
+        task.cancel()
+
+    assert "spin" in profile
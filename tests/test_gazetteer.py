@@ -0,0 +1,56 @@
+from utils.gazetteer import Gazetteer, Place, normalize
+
+gazetteer = Gazetteer(
+    [
+        (Place("New York", "US"), ["nyc"]),
+        (Place("San Francisco", "US"), ["sf"]),
+        (Place("San Diego", "US"), []),
+        (Place("Sao Paulo", "BR"), []),
+        (Place("Paris", "FR"), []),
+        (Place("Paris", "US"), []),
+    ]
+)
+
+
+def test_normalize():
+    assert normalize("  São   Paulo ") == "sao paulo"
+    assert normalize("St. Louis") == "st louis"
+    assert normalize("Winston-Salem") == "winston salem"
+
+
+def test_aliases_prefixes_and_typos():
+    assert gazetteer.resolve("NYC") == Place("New York", "US")
+    assert gazetteer.resolve("san fran") == Place("San Francisco", "US")
+    assert gazetteer.resolve("Sao Pualo") == Place("Sao Paulo", "BR")
+    # Ambiguous prefixes and unknown names are not guessed
+    assert gazetteer.resolve("san ") is None
+    assert gazetteer.resolve("Springfield") is None
+
+
+def test_names_of_other_places_are_not_guessed():
+    default = Gazetteer.from_csv()
+    # Prefixes of aliases (kobenhavn), short or partial prefixes, and names a
+    # known name merely extends or truncates are likely other places
+    for city in ("Kobe", "Mila", "Port", "Sant", "Lyons", "Milans"):
+        assert default.resolve(city) is None, city
+    assert default.resolve("Copenhagn") == Place("Copenhagen", "DK")
+    assert default.resolve("Philadel") == Place("Philadelphia", "US")
+
+
+def test_country_disambiguates():
+    assert gazetteer.resolve("Paris") == Place("Paris", "FR")
+    assert gazetteer.resolve("Paris", "us") == Place("Paris", "US")
+    assert gazetteer.resolve("New York", "GB") is None
+
+
+def test_canonical():
+    assert gazetteer.canonical("new york, usa") == ("New York", "US")
+    assert gazetteer.canonical("NYC", "us") == ("New York", "US")
+    assert gazetteer.canonical("  Springfield ", "US") == ("springfield", "US")
+    assert gazetteer.canonical("Paris, France") == ("Paris", "FR")
+    # Unknown country names are left out rather than sent upstream
+    assert gazetteer.canonical("Springfield, Freedonia") == ("springfield", None)
+
+
+def test_default_index_loads():
+    assert Gazetteer.from_csv().resolve("bombay") == Place("Mumbai", "IN")
@@ -0,0 +1,134 @@
+import asyncio
+import pytest
+from utils.admission import AdmissionController
+from utils.deadline import deadline_after
+from utils.plan import Plan, PlanError, execute_plan
+from utils.registry import ServerRegistry, ServerSpec
+from utils.server import FastMCPServer
+from utils.usage import UsageTracker
+
+# Loaded by the registry through the spec below
+plan_mcp = FastMCPServer(name="plan-server", stateless_http=True)
+
+# Two capital lookups only get past this when they run at the same time
+capital_barrier = asyncio.Barrier(2)
+
+
+@plan_mcp.tool()
+async def capital(country: str) -> dict:
+    async with asyncio.timeout(1):
+        await capital_barrier.wait()
+    return {"country": country, "capitals": ["Paris"]}
+
+
+@plan_mcp.tool()
+async def weather(city: str) -> dict:
+    await asyncio.sleep(0.05)
+    return {"city": city, "temperature": 21.5}
+
+
+@plan_mcp.tool()
+async def fail() -> dict:
+    raise ValueError("upstream down")
+
+
+SPEC = ServerSpec("plan", "tests.test_plan", "Plan server", attr="plan_mcp")
+
+
+registry = ServerRegistry([SPEC])
+
+
+def make_plan(*steps):
+    return Plan(steps=[{"server": "plan", **step} for step in steps])
+
+
+@pytest.mark.asyncio
+async def test_references_and_concurrency():
+    plan = make_plan(
+        {"id": "fr", "tool": "capital", "arguments": {"country": "FR"}},
+        {"id": "de", "tool": "capital", "arguments": {"country": "DE"}},
+        {
+            "id": "weather",
+            "tool": "weather",
+            "arguments": {"city": {"$ref": "fr.capitals.0"}},
+        },
+    )
+
+    async with registry.run():
+        result = await execute_plan(plan, registry)
+
+    results = result["results"]
+    # fr and de must have run concurrently to pass the barrier in capital()
+    assert results["fr"]["status"] == "ok"
+    assert results["de"]["result"]["country"] == "DE"
+    assert results["weather"]["result"] == {"city": "Paris", "temperature": 21.5}
+
+
+@pytest.mark.asyncio
+async def test_failed_dependency_skips_step():
+    plan = make_plan(
+        {"id": "broken", "tool": "fail"},
+        {"id": "after", "tool": "weather", "depends_on": ["broken"]},
+        {"id": "other", "tool": "weather", "arguments": {"city": "Oslo"}},
+    )
+
+    async with registry.run():
+        results = (await execute_plan(plan, registry))["results"]
+
+    assert results["broken"]["status"] == "error"
+    assert "upstream down" in results["broken"]["error"]
+    assert results["after"]["status"] == "skipped"
+    assert results["other"]["status"] == "ok"
+
+
+@pytest.mark.asyncio
+async def test_steps_are_charged_to_the_client():
+    tracker = UsageTracker({"agent": {"weather": 1}})
+    plan = make_plan(
+        {"id": "paris", "tool": "weather", "arguments": {"city": "Paris"}},
+        {"id": "oslo", "tool": "weather", "arguments": {"city": "Oslo"}},
+    )
+
+    async with registry.run():
+        results = (
+            await execute_plan(plan, registry, client="agent", usage=tracker)
+        )["results"]
+
+    assert sorted(r["status"] for r in results.values()) == ["error", "ok"]
+    error = next(r["error"] for r in results.values() if r["status"] == "error")
+    assert "Quota exceeded" in error
+    agent = tracker.report()["clients"]["agent"]
+    assert agent["tools"] == {"weather": 1} and agent["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_steps_wait_for_admission_within_the_deadline():
+    controller = AdmissionController({"/plan": "plan"}, server_concurrency=1)
+    plan = make_plan({"id": "paris", "tool": "weather", "arguments": {"city": "Paris"}})
+
+    async with registry.run():
+        with deadline_after(0):
+            results = (
+                await execute_plan(plan, registry, admission=controller)
+            )["results"]
+
+    assert results["paris"]["status"] == "error"
+    assert controller.stats()["expired"] == 1
+
+
+@pytest.mark.asyncio
+async def test_invalid_plans():
+    cycle = make_plan(
+        {"id": "a", "tool": "weather", "depends_on": ["b"]},
+        {"id": "b", "tool": "weather", "arguments": {"city": {"$ref": "a.city"}}},
+    )
+    with pytest.raises(PlanError, match="cycle"):
+        await execute_plan(cycle, registry)
+
+    unknown = make_plan({"id": "a", "tool": "weather", "depends_on": ["missing"]})
+    with pytest.raises(PlanError, match="unknown step"):
+        await execute_plan(unknown, registry)
+
+    bad_server = Plan(steps=[{"id": "a", "server": "nope", "tool": "weather"}])
+    with pytest.raises(PlanError, match="unknown server"):
+        await execute_plan(bad_server, registry)
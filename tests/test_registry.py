@@ -0,0 +1,44 @@
+import pytest
+from utils.api_clients import APIClient
+from utils.registry import ServerRegistry, ServerSpec, discover_servers
+from utils.server import FastMCPServer
+
+# Loaded by the registry through the spec below
+echo_client = APIClient(base_url="https://example.com")
+echo_mcp = FastMCPServer(
+    name="echo-server", stateless_http=True, clients=[echo_client]
+)
+
+ECHO = ServerSpec("echo", "tests.test_registry", "Echo server", attr="echo_mcp")
+
+
+def test_discover_servers():
+    specs = {spec.name: spec for spec in discover_servers()}
+
+    assert {"weather", "news", "currency", "quotes"} <= set(specs)
+    assert specs["weather"].module == "servers.weather"
+    assert specs["weather"].path == "/weather"
+    assert specs["weather"].description == "Weather data and forecasts"
+
+
+def test_unknown_server():
+    with pytest.raises(ValueError, match="Unknown MCP servers: missing"):
+        ServerRegistry([ECHO], enabled=["echo", "missing"])
+
+
+@pytest.mark.asyncio
+async def test_lazy_load():
+    registry = ServerRegistry([ECHO], enabled=["echo"])
+
+    async with registry.run():
+        assert registry.loaded == []
+        assert registry.get_server("echo") is None
+
+        app = await registry.load("echo")
+
+        assert await registry.load("echo") is app
+        assert registry.loaded == ["echo"]
+        assert registry.get_server("echo") is echo_mcp
+        assert not echo_client.client.is_closed
+
+    assert echo_client._client is None
@@ -0,0 +1,55 @@
+import json
+import pytest
+from unittest.mock import patch
+from utils import serialization
+from utils.models import Quote
+from utils.server import FastMCPServer
+
+
+def test_dumps_round_trip():
+    payload = {"base_code": "USD", "conversion_rates": {"EUR": 0.85, "JPY": 110.0}}
+
+    assert serialization.loads(serialization.dumps(payload)) == payload
+    assert json.loads(serialization.dumps_str(payload, indent=True)) == payload
+
+
+def test_stdlib_fallback():
+    payload = {"title": "Café", "published_at": None, "rates": [1, 2.5]}
+
+    with patch.object(serialization, "orjson", None):
+        encoded = serialization.dumps(payload)
+
+        assert encoded == json.dumps(
+            payload, ensure_ascii=False, separators=(",", ":")
+        ).encode()
+        assert serialization.loads(encoded) == payload
+
+
+def test_dumps_models():
+    quote = Quote(quote="Stay hungry.", author="Steve Jobs", length=12, tags=["life"])
+    expected = {
+        "quote": "Stay hungry.",
+        "author": "Steve Jobs",
+        "length": 12,
+        "tags": ["life"],
+    }
+
+    assert serialization.loads(serialization.dumps({"quotes": [quote]})) == {
+        "quotes": [expected]
+    }
+    with patch.object(serialization, "orjson", None):
+        assert serialization.loads(serialization.dumps(quote)) == expected
+
+
+@pytest.mark.asyncio
+async def test_call_tool_serializes_dict():
+    mcp = FastMCPServer(name="test-server")
+
+    @mcp.tool()
+    async def echo(value: str) -> dict:
+        return {"value": value}
+
+    content = await mcp.call_tool("echo", {"value": "hello"})
+
+    assert len(content) == 1
+    assert json.loads(content[0].text) == {"value": "hello"}
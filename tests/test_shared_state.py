@@ -0,0 +1,74 @@
+import os
+import sqlite3
+import stat
+import time
+from utils.config import Settings
+from utils.shared_state import SharedStore
+from utils.workers import shared_state
+
+
+def test_get_set(tmp_path):
+    store = SharedStore(str(tmp_path / "state.sqlite"))
+
+    store.set("cache", "USD", b"rates", ttl=60)
+
+    assert store.get("cache", "USD") == b"rates"
+    assert store.get("cache", "EUR") is None
+    assert store.get("other", "USD") is None
+
+
+def test_expiry(tmp_path):
+    store = SharedStore(str(tmp_path / "state.sqlite"))
+
+    store.set("cache", "USD", b"rates", ttl=0.01)
+    time.sleep(0.02)
+
+    assert store.get("cache", "USD") is None
+    assert store.purge() == 1
+
+
+def test_incr_shared_between_connections(tmp_path):
+    path = str(tmp_path / "state.sqlite")
+    first, second = SharedStore(path), SharedStore(path)
+
+    assert first.incr("quota", "client-a") == 1
+    assert second.incr("quota", "client-a", 2) == 3
+    assert first.incr("quota", "client-b") == 1
+
+
+def test_incr_window_resets(tmp_path):
+    store = SharedStore(str(tmp_path / "state.sqlite"))
+
+    store.incr("quota", "client-a", 5, ttl=0.01)
+    time.sleep(0.02)
+
+    assert store.incr("quota", "client-a", ttl=0.01) == 1
+
+
+def test_busy_store_is_a_miss(tmp_path):
+    path = str(tmp_path / "state.sqlite")
+    store = SharedStore(path)
+    store.set("cache", "USD", b"rates", ttl=60)
+
+    writer = sqlite3.connect(path, isolation_level=None)
+    writer.execute("BEGIN EXCLUSIVE")
+    try:
+        assert store.incr("quota", "client-a") is None
+        store.set("cache", "EUR", b"rates", ttl=60)
+    finally:
+        writer.execute("ROLLBACK")
+        writer.close()
+
+    assert store.get("cache", "EUR") is None
+    assert store.incr("quota", "client-a") == 1
+
+
+def test_worker_state_lives_in_a_private_directory(monkeypatch):
+    monkeypatch.delenv("SHARED_STATE_PATH", raising=False)
+
+    with shared_state(Settings(shared_state_path=None)) as path:
+        directory = os.path.dirname(path)
+        assert stat.S_IMODE(os.stat(directory).st_mode) == 0o700
+        SharedStore(path).set("cache", "USD", b"rates", ttl=60)
+
+    assert not os.path.exists(directory)
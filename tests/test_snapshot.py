@@ -0,0 +1,98 @@
+import asyncio
+import json
+import pytest
+from utils.cache import cached, use_snapshot
+from utils.models import Quote
+from utils.snapshot import CacheSnapshot
+
+calls = []
+
+
+@cached(ttl=60)
+async def random_quote(tag: str) -> Quote:
+    calls.append(tag)
+    return Quote(quote=f"About {tag}", author="Anonymous", length=16, tags=[tag])
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    yield str(tmp_path / "snapshot" / "cache.sqlite")
+    use_snapshot(None)
+    random_quote.cache.clear()
+    calls.clear()
+
+
+@pytest.mark.asyncio
+async def test_restore_after_restart(snapshot_path):
+    caches = {"random_quote": random_quote.cache}
+    original = await random_quote("wisdom")
+    assert CacheSnapshot(snapshot_path, caches).save() == 1
+
+    # A new process starts with empty caches
+    random_quote.cache.clear()
+    calls.clear()
+    snapshot = CacheSnapshot(snapshot_path, caches)
+    assert snapshot.open() == 1
+    use_snapshot(snapshot)
+
+    restored = await random_quote(tag="wisdom")
+
+    # Restored values are plain dicts, as read back from JSON
+    assert calls == []
+    assert restored == original.to_dict()
+    key, _ = random_quote.cache.key_for({"tag": "wisdom"})
+    assert random_quote.cache.arguments(key) == {"tag": "wisdom"}
+    await random_quote("life")
+    assert calls == ["life"]
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_not_restored(snapshot_path):
+    caches = {"random_quote": random_quote.cache}
+    random_quote.cache.ttl = 0.01
+    try:
+        await random_quote("success")
+        CacheSnapshot(snapshot_path, caches).save()
+    finally:
+        random_quote.cache.ttl = 60
+
+    await asyncio.sleep(0.02)
+    random_quote.cache.clear()
+    snapshot = CacheSnapshot(snapshot_path, caches)
+
+    assert snapshot.open() == 0
+    assert snapshot.save() == 0
+
+
+def test_entries_are_stored_as_json(snapshot_path):
+    caches = {"random_quote": random_quote.cache}
+    key, arguments = random_quote.cache.key_for({"tag": "calm"})
+    random_quote.cache.set(key, Quote("Calm", "Anonymous", 4, ["calm"]), arguments)
+    CacheSnapshot(snapshot_path, caches).save()
+
+    snapshot = CacheSnapshot(snapshot_path, caches)
+    (value,) = snapshot._connect().execute("SELECT value FROM entries").fetchone()
+    snapshot.close()
+
+    assert json.loads(value)["tags"] == ["calm"]
+
+
+@pytest.mark.asyncio
+async def test_load_does_not_wait_for_a_save(snapshot_path):
+    caches = {"random_quote": random_quote.cache}
+    await random_quote("hope")
+    CacheSnapshot(snapshot_path, caches).save()
+    key, _ = random_quote.cache.key_for({"tag": "hope"})
+
+    snapshot = CacheSnapshot(snapshot_path, caches)
+    snapshot.open()
+    # A save in progress in another thread holds the lock and a write transaction
+    with snapshot._lock:
+        writer = snapshot._connect()
+        writer.execute("BEGIN IMMEDIATE")
+        writer.execute("DELETE FROM entries")
+        loaded = snapshot.load("random_quote", key)
+        writer.execute("ROLLBACK")
+    snapshot.close()
+
+    assert loaded is not None and loaded[1]["quote"] == "About hope"
@@ -0,0 +1,143 @@
+import asyncio
+import httpx
+import pytest
+from starlette.datastructures import Headers
+from utils.api_clients import APIClient
+from utils.usage import (
+    QuotaExceeded,
+    UsageMiddleware,
+    UsageTracker,
+    current_client,
+    identify,
+)
+from tests.helpers import call, mcp_app
+
+
+def make_app(tracker):
+    inner, release = mcp_app("news")
+    return UsageMiddleware(inner, {"/news": "news"}, tracker=tracker), release
+
+
+def test_identify():
+    assert identify(Headers({"x-client-id": "agent-1"}), "X-Client-ID") == "agent-1"
+    token = identify(Headers({"authorization": "Bearer secret"}), "X-Client-ID")
+    assert token.startswith("token:") and "secret" not in token
+    assert identify(Headers({}), "X-Client-ID") == "anonymous"
+
+
+@pytest.mark.asyncio
+async def test_tool_quota_is_enforced_per_client():
+    tracker = UsageTracker({"*": {"get_top_headlines": 2}})
+    app, _ = make_app(tracker)
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        noisy = [
+            await client.post(
+                "/news/mcp/",
+                json=call("get_top_headlines", id=i),
+                headers={"X-Client-ID": "noisy"},
+            )
+            for i in range(3)
+        ]
+        other = await client.post(
+            "/news/mcp/",
+            json=call("get_top_headlines"),
+            headers={"X-Client-ID": "other"},
+        )
+
+    assert [r.status_code for r in noisy] == [200, 200, 429]
+    assert noisy[0].json()["client"] == "noisy"
+    assert noisy[2].json()["id"] == 2
+    assert noisy[2].json()["error"]["code"] == -32001
+    assert int(noisy[2].headers["retry-after"]) >= 1
+    assert other.status_code == 200
+
+    report = tracker.report()["clients"]
+    # Rejected calls are not counted as calls
+    assert report["noisy"]["tools"] == {"get_top_headlines": 2}
+    assert report["noisy"]["rejected"] == {"get_top_headlines": 1}
+    assert report["other"]["calls"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_capped_except_for_priority_clients():
+    tracker = UsageTracker(client_concurrency=1, priority=["vip"])
+    app, release = make_app(tracker)
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+
+        async def post(name, client_id):
+            return await client.post(
+                "/news/mcp/", json=call(name), headers={"X-Client-ID": client_id}
+            )
+
+        slow = [
+            asyncio.create_task(post("slow", "busy")),
+            asyncio.create_task(post("slow", "vip")),
+        ]
+        await asyncio.sleep(0.05)
+        busy = await post("fast", "busy")
+        vip = await post("fast", "vip")
+        release.set()
+        await asyncio.gather(*slow)
+
+    assert busy.status_code == 429
+    assert vip.status_code == 200
+    clients = tracker.report()["clients"]
+    assert all(record["active"] == 0 for record in clients.values())
+    assert clients["busy"]["rejected"] == {"concurrency": 1}
+
+
+def test_requests_over_the_concurrency_limit_are_not_charged():
+    tracker = UsageTracker({"*": {"calls": 2}}, client_concurrency=1)
+    first = tracker.admit("agent", "search")
+    with pytest.raises(QuotaExceeded):
+        tracker.admit("agent", "search")
+    tracker.exit(first)
+    # The refused call did not use up the quota
+    tracker.exit(tracker.admit("agent", "search"))
+
+    assert tracker.report()["clients"]["agent"]["calls"] == 2
+
+
+def test_idle_clients_are_evicted_least_recently_seen_first():
+    tracker = UsageTracker({"quota": {"calls": 10}}, priority=["vip"], max_clients=3)
+    busy = tracker.admit("a", "search")
+    for client in ("quota", "vip", "b", "c", "b", "d"):
+        tracker.exit(tracker.admit(client, "search"))
+
+    clients = tracker.report()["clients"]
+    # Configured and priority clients do not count towards max_clients; "a"
+    # is busy, and "c" was seen less recently than "b"
+    assert set(clients) == {"a", "quota", "vip", "b", "d", "(other)"}
+    assert clients["(other)"]["calls"] == 1
+    assert clients["b"]["calls"] == 2
+    tracker.exit(busy)
+
+
+@pytest.mark.asyncio
+async def test_upstream_quota_is_charged_to_the_current_client(monkeypatch):
+    tracker = UsageTracker({"agent-1": {"newsapi.org": 1}})
+    monkeypatch.setattr("utils.api_clients.usage", tracker)
+
+    async def handler(request):
+        return httpx.Response(200, json={})
+
+    client = APIClient("https://newsapi.org/v2", transport=httpx.MockTransport(handler))
+    # Background work (no client) is counted but never limited
+    await client.get("/top-headlines")
+    token = current_client.set("agent-1")
+    try:
+        await client.get("/top-headlines")
+        with pytest.raises(QuotaExceeded):
+            await client.get("/top-headlines")
+    finally:
+        current_client.reset(token)
+        await client.aclose()
+
+    clients = tracker.report()["clients"]
+    # The refused request is not counted
+    assert clients["agent-1"]["upstream"] == {"newsapi.org": 1}
+    assert clients["(internal)"]["upstream"] == {"newsapi.org": 1}
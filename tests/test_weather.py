@@ -77,4 +77,26 @@ async def test_get_weather_by_coordinates():
         assert result["city"] == "London"
         assert result["country"] == "GB"
         assert result["temperature"] == 15.5
-        assert result["description"] == "overcast clouds"
\ No newline at end of file
+        assert result["description"] == "overcast clouds"
+
+@pytest.mark.asyncio
+async def test_city_aliases_share_one_request():
+    mock_response = {
+        "name": "New York",
+        "sys": {"country": "US"},
+        "main": {"temp": 22.0, "feels_like": 21.4, "humidity": 60, "pressure": 1015},
+        "weather": [{"description": "clear sky"}],
+        "wind": {"speed": 4.1},
+    }
+
+    with patch(
+        "servers.weather.weather_client.get", new_callable=AsyncMock
+    ) as mock_get:
+        mock_get.return_value = mock_response
+
+        for city in ["NYC", "new york, us", "New York"]:
+            result = await get_current_weather(city)
+
+        assert result["city"] == "New York"
+        assert mock_get.call_count == 1
+        assert mock_get.call_args.kwargs["params"]["q"] == "New York,US"
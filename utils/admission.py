@@ -0,0 +1,273 @@
+import asyncio
+import contextlib
+import logging
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from utils.asgi import buffer_body, parse_jsonrpc, send_jsonrpc_error, server_for
+from utils.cache import CACHES
+from utils.deadline import deadline_after, remaining
+
+logger = logging.getLogger(__name__)
+
+# Header clients use to pass the time (in seconds) they will wait for an answer
+DEADLINE_HEADER = "x-request-timeout"
+
+# JSON-RPC error code returned when a request is shed
+OVERLOADED = -32000
+
+
+class Overloaded(Exception):
+    """Work was shed, or its deadline passed before it got a slot"""
+
+    def __init__(self, message: str, status: int, retry_after: Optional[float]):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+class Limiter:
+    """Concurrency limit with a bounded FIFO queue of waiters.
+
+    A released slot is handed straight to the oldest waiter, so waiters are
+    served in order and newcomers cannot overtake them.
+    """
+
+    def __init__(self, limit: int, queue_size: int):
+        self.limit = limit
+        self.queue_size = queue_size
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def try_acquire(self) -> bool:
+        """Take a slot if one is free and nobody is queued"""
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return True
+        return False
+
+    async def acquire(self, timeout: float) -> bool:
+        """Wait up to ``timeout`` seconds for a slot (False if the queue is full)"""
+        if self.try_acquire():
+            return True
+        if timeout <= 0 or len(self._waiters) >= self.queue_size:
+            return False
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            async with asyncio.timeout(timeout):
+                await future
+        except TimeoutError:
+            self._abandon(future)
+            return False
+        except asyncio.CancelledError:
+            self._abandon(future)
+            raise
+        return True
+
+    def _abandon(self, future: asyncio.Future) -> None:
+        if future.done() and not future.cancelled():
+            # The slot was handed over just as we gave up
+            self.release()
+            return
+        future.cancel()
+        try:
+            self._waiters.remove(future)
+        except ValueError:
+            pass
+
+    def release(self) -> None:
+        while self._waiters:
+            future = self._waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+                return
+        self.active -= 1
+
+
+def cache_servable(body: bytes) -> bool:
+    """Whether a JSON-RPC request is a tool call answered from a live cache entry"""
+    request = parse_jsonrpc(body)
+    try:
+        params = request["params"]
+        if request.get("method") != "tools/call":
+            return False
+        cache = CACHES.get(params["name"])
+        if cache is None:
+            return False
+        key, _ = cache.key_for(params.get("arguments") or {})
+    except Exception:
+        return False
+    return cache.expires_in(key) > 0
+
+
+class AdmissionController:
+    """Concurrency limits and counters for the MCP mounts.
+
+    At most ``server_concurrency`` requests per server and ``max_concurrency``
+    overall are handled at once. Up to ``queue_size`` more wait per limit, for
+    at most ``queue_timeout`` seconds or the client's deadline (the
+    ``X-Request-Timeout`` header), whichever is shorter; anything else gets an
+    immediate 503 with Retry-After. Tool calls that a live cache entry can
+    answer skip the queue. Applied by AdmissionMiddleware to the MCP mounts,
+    and through slot() to plan steps.
+    """
+
+    def __init__(
+        self,
+        servers: Dict[str, str],
+        max_concurrency: int = 64,
+        server_concurrency: int = 16,
+        queue_size: int = 32,
+        queue_timeout: float = 2.0,
+    ):
+        # Mount path -> server name
+        self.servers = servers
+        self.queue_timeout = queue_timeout
+        self.limiter = Limiter(max_concurrency, queue_size)
+        self.server_limiters = {
+            name: Limiter(server_concurrency, queue_size) for name in servers.values()
+        }
+        self.shed = 0
+        self.expired = 0
+
+    def limiters(self, server: str) -> List[Limiter]:
+        return [self.server_limiters[server], self.limiter]
+
+    async def acquire(self, server: str) -> None:
+        """Wait for a slot on ``server`` and overall; release() it when done.
+
+        Waits at most the queue timeout, and not past the current deadline.
+        Raises Overloaded, holding nothing, if no slot frees up in time.
+        """
+        left = remaining()
+        if left is not None and left <= 0:
+            raise self._rejection()
+        acquired: List[Limiter] = []
+        try:
+            for limiter in self.limiters(server):
+                left = remaining()
+                wait = self.queue_timeout
+                if left is not None:
+                    wait = min(wait, left)
+                if not await limiter.acquire(wait):
+                    raise self._rejection()
+                acquired.append(limiter)
+        except BaseException:
+            for limiter in acquired:
+                limiter.release()
+            raise
+
+    def release(self, server: str) -> None:
+        for limiter in self.limiters(server):
+            limiter.release()
+
+    @contextlib.asynccontextmanager
+    async def slot(self, server: str) -> AsyncIterator[None]:
+        """Hold a slot on ``server`` for the enclosed work (see acquire())"""
+        await self.acquire(server)
+        try:
+            yield
+        finally:
+            self.release(server)
+
+    def _rejection(self) -> "Overloaded":
+        left = remaining()
+        if left is not None and left <= 0:
+            self.expired += 1
+            return Overloaded("Request deadline exceeded", 504, None)
+        self.shed += 1
+        return Overloaded("Server overloaded, retry later", 503, 1)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "active": self.limiter.active,
+            "waiting": self.limiter.waiting
+            + sum(limiter.waiting for limiter in self.server_limiters.values()),
+            "shed": self.shed,
+            "expired": self.expired,
+            "servers": {
+                name: {"active": limiter.active, "waiting": limiter.waiting}
+                for name, limiter in self.server_limiters.items()
+            },
+        }
+
+
+class AdmissionMiddleware:
+    """Applies an AdmissionController and the client's deadline to MCP requests"""
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        server = None
+        if scope["type"] == "http" and scope["method"] == "POST":
+            server = server_for(self.controller.servers, scope["path"])
+        if server is None:
+            await self.app(scope, receive, send)
+            return
+
+        with deadline_after(header_timeout(Headers(scope=scope))):
+            await self._admit(server, scope, receive, send)
+
+    async def _admit(
+        self, server: str, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        limiters = self.controller.limiters(server)
+        left = remaining()
+        expired = left is not None and left <= 0
+
+        # Fast path: free slots, no need to look at the request
+        if not expired and limiters[0].try_acquire():
+            if limiters[1].try_acquire():
+                await self._run(server, scope, receive, send)
+                return
+            limiters[0].release()
+
+        body, receive = await buffer_body(receive)
+        if not expired and cache_servable(body):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await self.controller.acquire(server)
+        except Overloaded as e:
+            logger.debug("Rejected request to %r: %s", server, e)
+            await send_jsonrpc_error(
+                send,
+                e.status,
+                parse_jsonrpc(body).get("id"),
+                OVERLOADED,
+                str(e),
+                retry_after=e.retry_after,
+            )
+            return
+        await self._run(server, scope, receive, send)
+
+    async def _run(
+        self, server: str, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(server)
+
+
+def header_timeout(headers: Headers) -> Optional[float]:
+    """Time budget a client sent in the ``X-Request-Timeout`` header, if any"""
+    value = headers.get(DEADLINE_HEADER)
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
@@ -1,27 +1,158 @@
 import httpx
+import time
 from typing import Dict, Any, Optional
 import asyncio
+from utils.config import settings
+from utils.deadline import DeadlineExceeded, remaining
+from utils.diagnostics import diagnostics
+from utils.latency import LatencyTracker
+from utils.serialization import loads
+from utils.usage import QuotaExceeded, usage
 
 
 class APIClient:
-    def __init__(self, base_url: str, default_headers: Optional[Dict[str, str]] = None):
+    def __init__(
+        self,
+        base_url: str,
+        default_headers: Optional[Dict[str, str]] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        hedging: Optional[bool] = None,
+    ):
         self.base_url = base_url
+        # Name of the upstream in usage accounting and quotas
+        self.upstream = httpx.URL(base_url).host
         self.default_headers = default_headers or {}
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self.hedging = settings.upstream_hedging if hedging is None else hedging
+        self.latency = LatencyTracker(
+            default_timeout=settings.upstream_timeout,
+            min_timeout=settings.upstream_min_timeout,
+            max_timeout=settings.upstream_max_timeout,
+            hedge_ratio=settings.upstream_hedge_ratio,
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Pooled HTTP client, created on first use and reused across requests"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(transport=self._transport)
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def get(
         self,
         endpoint: str,
         params: Optional[Dict[str, Any]] = None,
         headers: Optional[Dict[str, str]] = None,
+        name: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Make GET request to API endpoint"""
+        """Make GET request to API endpoint.
+
+        Latencies are tracked per ``name`` (default: the endpoint); pass a name
+        for endpoints with variable paths. The timeout adapts to the endpoint's
+        recent p99, and with hedging enabled a second request is sent once the
+        first has taken longer than the p95. The timeout never exceeds what is
+        left of the current request's deadline, and the request counts toward
+        the current client's quota for this upstream.
+        """
         url = f"{self.base_url}{endpoint}"
         request_headers = {**self.default_headers, **(headers or {})}
+        name = name or endpoint
+
+        usage.charge_upstream(self.upstream)
+        self.latency.count_request()
+        delay = self.latency.hedge_delay(name) if self.hedging else None
+        started = time.perf_counter()
+        try:
+            if delay is None:
+                response = await self._timed_get(name, url, params, request_headers)
+            else:
+                response = await self._hedged_get(
+                    name, url, params, request_headers, delay
+                )
+        finally:
+            diagnostics.record_upstream(time.perf_counter() - started)
+        response.raise_for_status()
+        return loads(response.content)
+
+    async def _timed_get(
+        self,
+        name: str,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        headers: Dict[str, str],
+    ) -> httpx.Response:
+        timeout = self.latency.timeout(name)
+        left = remaining()
+        capped = left is not None and left < timeout
+        if capped:
+            if left <= 0:
+                raise DeadlineExceeded(f"No time left for {name}")
+            timeout = left
+        started = time.perf_counter()
+        try:
+            response = await self.client.get(
+                url, params=params, headers=headers, timeout=timeout
+            )
+        except httpx.TimeoutException:
+            # A deadline cut says nothing about the upstream's latency
+            if not capped:
+                self.latency.record(name, timeout)
+            raise
+        self.latency.record(name, time.perf_counter() - started)
+        return response
+
+    async def _hedged_get(
+        self,
+        name: str,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        headers: Dict[str, str],
+        delay: float,
+    ) -> httpx.Response:
+        """Send a backup request after ``delay`` and return whichever succeeds first"""
+        primary = asyncio.create_task(self._timed_get(name, url, params, headers))
+        started = {primary: time.perf_counter()}
+        pending = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if done or not self.latency.take_hedge():
+                return await primary
+            # The backup is a request like any other for the client's quota;
+            # without the room for it, wait for the primary
+            try:
+                usage.charge_upstream(self.upstream)
+            except QuotaExceeded:
+                return await primary
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=params, headers=request_headers)
-            response.raise_for_status()
-            return response.json()
+            backup = asyncio.create_task(self._timed_get(name, url, params, headers))
+            started[backup] = time.perf_counter()
+            pending = {primary, backup}
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        # The loser is cancelled below. Its time so far is a
+                        # lower bound of its latency; without it the slowest
+                        # requests would drop out of the percentiles
+                        for loser in pending:
+                            elapsed = time.perf_counter() - started[loser]
+                            self.latency.record(name, elapsed)
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
 
     async def post(
         self,
@@ -33,10 +164,14 @@ class APIClient:
         url = f"{self.base_url}{endpoint}"
         request_headers = {**self.default_headers, **(headers or {})}
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, json=data, headers=request_headers)
-            response.raise_for_status()
-            return response.json()
+        usage.charge_upstream(self.upstream)
+        started = time.perf_counter()
+        try:
+            response = await self.client.post(url, json=data, headers=request_headers)
+        finally:
+            diagnostics.record_upstream(time.perf_counter() - started)
+        response.raise_for_status()
+        return loads(response.content)
 
 
 # Retry decorator for API calls
@@ -0,0 +1,75 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from starlette.types import Message, Receive, Send
+
+from utils.serialization import dumps, loads
+
+
+def server_for(servers: Dict[str, str], path: str) -> Optional[str]:
+    """Name of the server whose mount path (in ``servers``) contains ``path``"""
+    for mount_path, name in servers.items():
+        if path == mount_path or path.startswith(mount_path + "/"):
+            return name
+    return None
+
+
+async def buffer_body(receive: Receive) -> Tuple[bytes, Receive]:
+    """Read the whole request body; return it and a receive that replays it"""
+    chunks = []
+    pending: List[Message] = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            # Disconnected: hand the message on as is
+            pending.append(message)
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    body = b"".join(chunks)
+    replay: List[Message] = [
+        {"type": "http.request", "body": body, "more_body": False},
+        *pending,
+    ]
+
+    async def replay_receive() -> Message:
+        if replay:
+            return replay.pop(0)
+        return await receive()
+
+    return body, replay_receive
+
+
+def parse_jsonrpc(body: bytes) -> Dict[str, Any]:
+    """The JSON-RPC request in ``body``, or an empty dict if it is not one"""
+    try:
+        request = loads(body)
+    except Exception:
+        return {}
+    return request if isinstance(request, dict) else {}
+
+
+async def send_jsonrpc_error(
+    send: Send,
+    status: int,
+    request_id: Any,
+    code: int,
+    message: str,
+    retry_after: Optional[float] = None,
+) -> None:
+    """Answer a JSON-RPC request with an error, without running the app"""
+    content = dumps(
+        {
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "error": {"code": code, "message": message},
+        }
+    )
+    headers = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(content)).encode()),
+    ]
+    if retry_after is not None:
+        headers.append((b"retry-after", str(max(1, round(retry_after))).encode()))
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": content})
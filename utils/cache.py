@@ -0,0 +1,229 @@
+import asyncio
+import functools
+import inspect
+import json
+import time
+from collections import OrderedDict
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+from utils.serialization import dumps, loads
+from utils.shared_state import shared_store
+
+if TYPE_CHECKING:
+    from utils.snapshot import CacheSnapshot
+
+MISSING = object()
+
+# Every cache created by @cached, keyed by tool (function) name
+CACHES: Dict[str, "TTLCache"] = {}
+
+# Snapshot consulted on a miss, see use_snapshot()
+_snapshot: Optional["CacheSnapshot"] = None
+
+
+def use_snapshot(snapshot: Optional["CacheSnapshot"]) -> None:
+    """Fall back to a persisted snapshot when a cache misses"""
+    global _snapshot
+    _snapshot = snapshot
+
+
+class TTLCache:
+    """In-process LRU cache whose entries expire ``ttl`` seconds after being set.
+
+    Entries are also written to the SharedStore (as JSON, so values read back
+    from another worker are plain dicts) when several workers run. On a local
+    miss the SharedStore is consulted, then the persisted snapshot (if any).
+    Accesses are counted per key (with periodic decay) so the warmer can learn
+    the hottest keys.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl: float,
+        maxsize: int = 1024,
+        refresh: Optional[Callable[..., Awaitable[Any]]] = None,
+        signature: Optional[inspect.Signature] = None,
+        normalize: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.refresh = refresh
+        self.signature = signature
+        self.normalize = normalize
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._arguments: Dict[str, Dict[str, Any]] = {}
+        self._hits: Dict[str, float] = {}
+
+    def key_for(self, arguments: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """Canonical key and full arguments (defaults applied, normalized)"""
+        if self.signature is not None:
+            bound = self.signature.bind(**arguments)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+        if self.normalize is not None:
+            arguments = self.normalize(arguments)
+        return json.dumps(arguments, sort_keys=True, default=str), arguments
+
+    def get(self, key: str) -> Any:
+        """Return a live value (counting the access), or MISSING"""
+        self._hits[key] = self._hits.get(key, 0.0) + 1.0
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > time.time():
+                self._entries.move_to_end(key)
+                return entry[1]
+            del self._entries[key]
+
+        store = shared_store()
+        if store is not None:
+            shared = store.get_with_expiry(f"cache:{self.name}", key)
+            if shared is not None:
+                value = loads(shared[0])
+                self._store_local(key, value, shared[1])
+                return value
+
+        if _snapshot is not None:
+            saved = _snapshot.load(self.name, key)
+            if saved is not None:
+                expires_at, value, arguments = saved
+                self._store_local(key, value, expires_at)
+                self.remember(key, arguments)
+                return value
+        return MISSING
+
+    def set(
+        self, key: str, value: Any, arguments: Dict[str, Any], share: bool = True
+    ) -> None:
+        """Store a value for ``ttl`` seconds"""
+        self._store_local(key, value, time.time() + self.ttl)
+        self._arguments[key] = arguments
+        store = shared_store()
+        if share and store is not None:
+            store.set(f"cache:{self.name}", key, dumps(value), self.ttl)
+
+    def _store_local(self, key: str, value: Any, expires_at: float) -> None:
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def expires_in(self, key: str) -> float:
+        """Seconds until the entry expires (0 when missing or expired)"""
+        entry = self._entries.get(key)
+        return max(0.0, entry[0] - time.time()) if entry else 0.0
+
+    def pull(self, key: str) -> None:
+        """Adopt a fresher entry another worker wrote to the SharedStore"""
+        store = shared_store()
+        if store is None:
+            return
+        shared = store.get_with_expiry(f"cache:{self.name}", key)
+        entry = self._entries.get(key)
+        if shared is not None and (entry is None or shared[1] > entry[0]):
+            self._store_local(key, loads(shared[0]), shared[1])
+
+    def arguments(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._arguments.get(key)
+
+    def remember(self, key: str, arguments: Dict[str, Any]) -> None:
+        """Record the arguments of a key so it can be refreshed before a call"""
+        self._arguments.setdefault(key, arguments)
+
+    def top_keys(self, k: int) -> List[str]:
+        """The ``k`` most accessed keys (recent accesses weigh most)"""
+        ranked = sorted(self._hits.items(), key=lambda item: item[1], reverse=True)
+        return [key for key, _ in ranked[:k] if key in self._arguments]
+
+    def decay(self, factor: float = 0.5) -> None:
+        """Age access counts, forgetting keys that are no longer requested"""
+        self._hits = {
+            key: hits * factor
+            for key, hits in self._hits.items()
+            if hits * factor >= 0.5
+        }
+        for key in list(self._arguments):
+            if key not in self._hits and key not in self._entries:
+                del self._arguments[key]
+
+    def items(self) -> List[Tuple[str, float, Any]]:
+        """Live ``(key, expires_at, value)`` entries"""
+        now = time.time()
+        return [
+            (key, expires_at, value)
+            for key, (expires_at, value) in self._entries.items()
+            if expires_at > now
+        ]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._arguments.clear()
+        self._hits.clear()
+
+
+def _retrieve_exception(task: asyncio.Task) -> None:
+    """Mark a failure as retrieved when every caller was cancelled"""
+    if not task.cancelled():
+        task.exception()
+
+
+def cached(
+    ttl: float,
+    maxsize: int = 1024,
+    normalize: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+):
+    """Cache a tool's results per distinct arguments for ``ttl`` seconds.
+
+    Concurrent calls with the same arguments share one upstream request.
+    ``normalize`` maps the arguments (with defaults applied) to canonical ones,
+    which the tool is then called with, so equivalent calls share an entry.
+    Apply below ``@mcp.tool()`` so FastMCP still sees the tool's signature.
+    """
+
+    def decorator(func):
+        signature = inspect.signature(func)
+        cache = TTLCache(func.__name__, ttl, maxsize, func, signature, normalize)
+        in_flight: Dict[str, asyncio.Task] = {}
+
+        async def fetch(key: str, arguments: Dict[str, Any]) -> Any:
+            try:
+                value = await func(**arguments)
+                cache.set(key, value, arguments)
+                return value
+            finally:
+                del in_flight[key]
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            key, arguments = cache.key_for(bound.arguments)
+
+            value = cache.get(key)
+            if value is not MISSING:
+                return value
+
+            # The upstream call runs in its own task, so a caller that is
+            # cancelled (e.g. its client disconnected) does not cancel the
+            # call for everyone else waiting on the same key
+            task = in_flight.get(key)
+            if task is None:
+                task = asyncio.create_task(fetch(key, arguments))
+                task.add_done_callback(_retrieve_exception)
+                in_flight[key] = task
+            return await asyncio.shield(task)
+
+        wrapper.cache = cache
+        CACHES[func.__name__] = cache
+        return wrapper
+
+    return decorator
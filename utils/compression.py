@@ -0,0 +1,209 @@
+import zlib
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - exercised when brotli is not installed
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - exercised when zstandard is not installed
+    zstandard = None
+
+
+# Content types worth compressing; everything else is passed through
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+
+class Encoder(ABC):
+    """Incremental compressor for one response body"""
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        """Compress ``data`` and flush, so everything so far can be decoded"""
+
+    @abstractmethod
+    def finish(self) -> bytes:
+        """End the compressed stream"""
+
+
+class GzipEncoder(Encoder):
+    def __init__(self, level: int = 6):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class BrotliEncoder(Encoder):
+    def __init__(self, quality: int = 4):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdEncoder(Encoder):
+    def __init__(self, level: int = 3):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+ENCODERS: Dict[str, Callable[[], Encoder]] = {"gzip": GzipEncoder}
+if brotli is not None:
+    ENCODERS["br"] = BrotliEncoder
+if zstandard is not None:
+    ENCODERS["zstd"] = ZstdEncoder
+
+
+def parse_accept_encoding(value: str) -> Dict[str, float]:
+    """Map each coding in an Accept-Encoding header to its q-value"""
+    accepted = {}
+    for item in value.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, number = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(number)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def choose_encoding(accept_encoding: str, preferred: Iterable[str]) -> Optional[str]:
+    """The first ``preferred`` encoding that is available and the client accepts"""
+    accepted = parse_accept_encoding(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    for encoding in preferred:
+        if encoding in ENCODERS and accepted.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+class CompressionMiddleware:
+    """Compresses JSON and SSE responses with gzip, brotli or zstd.
+
+    The encoding is negotiated from Accept-Encoding in the order of
+    ``encodings``. Responses are compressed when their first body chunk (for
+    SSE, the first event) reaches ``minimum_size`` bytes. The SSE stream of a
+    POST usually carries just the one result, so its headers wait for that
+    event. Standalone GET streams may idle for a long time, so they are always
+    compressed and their headers sent right away. Every chunk is flushed, so
+    events are delivered as soon as they are sent.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        encodings: Iterable[str] = ("zstd", "br", "gzip"),
+        minimum_size: int = 1024,
+    ):
+        self.app = app
+        self.encodings: List[str] = [e for e in encodings if e in ENCODERS]
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(
+            Headers(scope=scope).get("accept-encoding", ""), self.encodings
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressedResponder(
+            send, encoding, self.minimum_size, stream=scope["method"] == "GET"
+        )
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressedResponder:
+    def __init__(self, send: Send, encoding: str, minimum_size: int, stream: bool):
+        self._send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        # Whether an SSE response is a long-lived stream rather than one result
+        self.stream = stream
+        self._start: Optional[Message] = None
+        self._encoder: Optional[Encoder] = None
+        self._started = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self._start = message
+            headers = Headers(raw=message["headers"])
+            sse = headers.get("content-type", "").startswith("text/event-stream")
+            if sse and self.stream:
+                await self._begin(self._compressible())
+            return
+        if message["type"] != "http.response.body" or self._start is None:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if not self._started:
+            if not body and more_body:
+                return
+            await self._begin(
+                self._compressible() and len(body) >= self.minimum_size
+            )
+
+        if self._encoder is None:
+            await self._send(message)
+            return
+
+        if more_body:
+            body = self._encoder.compress(body) if body else b""
+        else:
+            body = self._encoder.compress(body) + self._encoder.finish()
+        await self._send(
+            {"type": "http.response.body", "body": body, "more_body": more_body}
+        )
+
+    async def _begin(self, compress: bool) -> None:
+        """Send the response headers, announcing the encoding when compressing"""
+        self._started = True
+        if compress:
+            self._encoder = ENCODERS[self.encoding]()
+            headers = MutableHeaders(scope=self._start)
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if "content-length" in headers:
+                del headers["content-length"]
+        await self._send(self._start)
+
+    def _compressible(self) -> bool:
+        headers = Headers(raw=self._start["headers"])
+        if self._start["status"] in (204, 206, 304) or "content-encoding" in headers:
+            return False
+        return headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
@@ -1,6 +1,7 @@
 import os
-from typing import Optional
-from pydantic_settings import BaseSettings
+from typing import Annotated, Any, Dict, List, Literal, Optional
+from pydantic import field_validator
+from pydantic_settings import BaseSettings, NoDecode
 
 
 class Settings(BaseSettings):
@@ -14,6 +15,105 @@ class Settings(BaseSettings):
     host: str = "0.0.0.0"
     log_level: str = "info"
 
+    # MCP servers to mount (comma-separated, empty for every discovered
+    # server), and whether to import and start each one on its first
+    # request instead of at startup
+    enabled_servers: Annotated[List[str], NoDecode] = []
+    lazy_servers: bool = True
+
+    # Worker processes: "shared" runs WORKERS identical workers on PORT,
+    # "per-server" runs WORKERS workers per enabled server on PORT + N
+    workers: int = 1
+    worker_mode: Literal["shared", "per-server"] = "shared"
+    # SQLite file for state shared between workers (set automatically when
+    # more than one worker runs)
+    shared_state_path: Optional[str] = None
+
+    # Cache warming: refresh the top-K keys of each tool (plus the arguments
+    # listed per tool in CACHE_WARM_KEYS, as JSON) shortly before they expire,
+    # refreshing at most CACHE_WARM_BUDGET entries per tool per minute
+    cache_warm_enabled: bool = True
+    cache_warm_tools: Annotated[List[str], NoDecode] = [
+        "get_current_weather",
+        "get_top_headlines",
+        "get_exchange_rates",
+    ]
+    cache_warm_top_k: int = 10
+    cache_warm_lead_time: float = 30.0
+    cache_warm_budget: int = 60
+    cache_warm_keys: Dict[str, List[Dict[str, Any]]] = {}
+
+    # Upstream requests: timeouts adapt to each endpoint's observed p99 within
+    # [UPSTREAM_MIN_TIMEOUT, UPSTREAM_MAX_TIMEOUT]; with hedging, a backup GET
+    # is sent after the p95 for at most UPSTREAM_HEDGE_RATIO of requests
+    upstream_timeout: float = 5.0
+    upstream_min_timeout: float = 0.5
+    upstream_max_timeout: float = 10.0
+    upstream_hedging: bool = False
+    upstream_hedge_ratio: float = 0.05
+
+    # Local file the caches are saved to periodically and on shutdown, and
+    # restored from on startup (disabled when unset)
+    cache_snapshot_path: Optional[str] = None
+    cache_snapshot_interval: float = 300.0
+
+    # Response compression on the MCP mounts: the first encoding in
+    # COMPRESSION_ENCODINGS the client accepts (zstd and br need the
+    # "compression" extra) for bodies of at least COMPRESSION_MINIMUM_SIZE bytes
+    compression_enabled: bool = True
+    compression_encodings: Annotated[List[str], NoDecode] = ["zstd", "br", "gzip"]
+    compression_minimum_size: int = 1024
+    # Answer MCP requests with a single JSON body instead of an SSE stream
+    mcp_json_response: bool = False
+
+    # Admission control on the MCP mounts: at most ADMISSION_MAX_CONCURRENCY
+    # requests in flight overall and ADMISSION_SERVER_CONCURRENCY per server.
+    # Up to ADMISSION_QUEUE_SIZE more wait per limit for at most
+    # ADMISSION_QUEUE_TIMEOUT seconds; the rest get an immediate 503
+    admission_enabled: bool = True
+    admission_max_concurrency: int = 64
+    admission_server_concurrency: int = 16
+    admission_queue_size: int = 32
+    admission_queue_timeout: float = 2.0
+
+    # Per-client usage accounting on the MCP mounts. Clients are identified by
+    # the CLIENT_ID_HEADER header, else a hash of their bearer token.
+    # CLIENT_QUOTAS (JSON) maps a client ID, or "*" for any other client, to
+    # limits per CLIENT_QUOTA_WINDOW seconds on "calls" (all tool calls), a
+    # tool name or an upstream host, e.g. {"*": {"newsapi.org": 100}}.
+    # CLIENT_CONCURRENCY caps the requests each client has in flight (0: no
+    # cap), except for PRIORITY_CLIENTS
+    usage_enabled: bool = True
+    client_id_header: str = "X-Client-ID"
+    client_quotas: Dict[str, Dict[str, int]] = {}
+    client_quota_window: float = 3600.0
+    client_concurrency: int = 0
+    priority_clients: Annotated[List[str], NoDecode] = []
+
+    # Opt-in event loop diagnostics under /admin/diagnostics. The /admin
+    # routes require "Authorization: Bearer <ADMIN_TOKEN>" (and are off
+    # without one).
+    # Loop stalls longer than DIAGNOSTICS_STALL_MS and tool calls slower than
+    # DIAGNOSTICS_SLOW_CALL_MS are recorded
+    diagnostics_enabled: bool = False
+    admin_token: Optional[str] = None
+    diagnostics_stall_ms: float = 100.0
+    diagnostics_slow_call_ms: float = 1000.0
+    diagnostics_slow_calls: int = 50
+
+    @field_validator(
+        "enabled_servers",
+        "cache_warm_tools",
+        "compression_encodings",
+        "priority_clients",
+        mode="before",
+    )
+    @classmethod
+    def split_names(cls, value):
+        if isinstance(value, str):
+            return [name.strip() for name in value.split(",") if name.strip()]
+        return value
+
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,40 @@
+import contextlib
+import time
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+# Monotonic time by which the current request must be answered, if any
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """The request's deadline passed before an upstream call could start"""
+
+
+@contextlib.contextmanager
+def deadline_after(seconds: Optional[float]) -> Iterator[None]:
+    """Give the enclosed work ``seconds`` to finish (None: no deadline).
+
+    An enclosing, earlier deadline is kept. Tasks started inside inherit it,
+    so upstream calls made by a tool cap their timeouts to what is left.
+    """
+    if seconds is None:
+        yield
+        return
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        deadline = min(deadline, current)
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left until the current deadline, or None without one"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
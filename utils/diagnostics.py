@@ -0,0 +1,280 @@
+import asyncio
+import contextlib
+import cProfile
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Frames kept from the top of a stalled loop's stack
+STACK_DEPTH = 30
+
+
+class CallTiming:
+    """Timing breakdown of one tool call"""
+
+    __slots__ = (
+        "server",
+        "tool",
+        "arguments",
+        "started",
+        "total",
+        "upstream",
+        "upstream_requests",
+        "serialize",
+    )
+
+    def __init__(self, server: str, tool: str, arguments: Dict[str, Any]):
+        self.server = server
+        self.tool = tool
+        self.arguments = arguments
+        self.started = time.time()
+        self.total = 0.0
+        self.upstream = 0.0
+        self.upstream_requests = 0
+        self.serialize = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "server": self.server,
+            "tool": self.tool,
+            "arguments": _truncate(self.arguments),
+            "started": self.started,
+            "total_ms": round(self.total * 1000, 1),
+            "upstream_ms": round(self.upstream * 1000, 1),
+            "upstream_requests": self.upstream_requests,
+            "serialize_ms": round(self.serialize * 1000, 1),
+            # Time on the event loop or waiting for it: cache lookups, parsing,
+            # and other tasks' callbacks
+            "other_ms": round(
+                max(0.0, self.total - self.upstream - self.serialize) * 1000, 1
+            ),
+        }
+
+
+# Tool call running in the current task, if diagnostics are enabled
+_current_call: ContextVar[Optional[CallTiming]] = ContextVar("call", default=None)
+
+
+def _truncate(arguments: Dict[str, Any], limit: int = 200) -> Dict[str, Any]:
+    return {
+        key: value[:limit] if isinstance(value, str) else value
+        for key, value in arguments.items()
+    }
+
+
+def _stack(frame: Any) -> List[str]:
+    """Innermost-last ``function (file:line)`` entries of a frame's stack"""
+    entries = []
+    while frame is not None and len(entries) < STACK_DEPTH:
+        code = frame.f_code
+        entries.append(
+            f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+        )
+        frame = frame.f_back
+    entries.reverse()
+    return entries
+
+
+class LoopMonitor:
+    """Measures event loop lag and captures the stack of callbacks that stall it.
+
+    A task sleeps ``interval`` seconds at a time and records how late it wakes
+    up. A watchdog thread checks on that task; when the loop has not come back
+    for ``stall_threshold`` seconds, it captures the loop thread's stack, which
+    shows the callback that is blocking it. The last ``history`` stalls are
+    kept.
+    """
+
+    def __init__(
+        self, interval: float = 0.1, stall_threshold: float = 0.1, history: int = 50
+    ):
+        self.interval = interval
+        self.stall_threshold = stall_threshold
+        self.lag = 0.0
+        self.mean_lag = 0.0
+        self.max_lag = 0.0
+        self.stall_count = 0
+        self.stalls: Deque[Dict[str, Any]] = deque(maxlen=history)
+        self._beat = 0.0
+        self._captured: Optional[tuple] = None
+
+    async def run(self) -> None:
+        """Monitor the running loop until cancelled"""
+        stop = threading.Event()
+        watchdog = threading.Thread(
+            target=self._watch,
+            args=(threading.get_ident(), stop),
+            name="loop-watchdog",
+            daemon=True,
+        )
+        watchdog.start()
+        try:
+            while True:
+                before = time.monotonic()
+                self._beat = before
+                await asyncio.sleep(self.interval)
+                self.record(time.monotonic() - before - self.interval, before)
+        finally:
+            stop.set()
+
+    def record(self, lag: float, beat: float) -> None:
+        self.lag = lag
+        self.mean_lag += 0.1 * (lag - self.mean_lag)
+        self.max_lag = max(self.max_lag, lag)
+        if lag < self.stall_threshold:
+            return
+        self.stall_count += 1
+        captured = self._captured
+        stack = captured[1] if captured is not None and captured[0] == beat else None
+        self.stalls.append(
+            {"at": time.time(), "lag_ms": round(lag * 1000, 1), "stack": stack}
+        )
+        logger.warning("Event loop stalled for %.0f ms", lag * 1000)
+
+    def _watch(self, loop_thread: int, stop: threading.Event) -> None:
+        while not stop.wait(self.stall_threshold / 2):
+            beat = self._beat
+            late = time.monotonic() - beat - self.interval
+            captured = self._captured
+            if late < self.stall_threshold or (captured and captured[0] == beat):
+                continue
+            frame = sys._current_frames().get(loop_thread)
+            self._captured = (beat, _stack(frame))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "lag_ms": round(self.lag * 1000, 1),
+            "mean_lag_ms": round(self.mean_lag * 1000, 1),
+            "max_lag_ms": round(self.max_lag * 1000, 1),
+            "stalls": self.stall_count,
+            "recent_stalls": list(self.stalls),
+        }
+
+
+class Diagnostics:
+    """Opt-in loop monitoring, slow tool call log and on-demand profiles.
+
+    Tool calls taking at least ``slow_call_threshold`` seconds are kept in a
+    ring buffer of the last ``slow_calls`` such calls, with their arguments and
+    a breakdown of where the time went.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        stall_threshold: float = 0.1,
+        slow_call_threshold: float = 1.0,
+        slow_calls: int = 50,
+    ):
+        self.enabled = enabled
+        self.monitor = LoopMonitor(stall_threshold=stall_threshold)
+        self.slow_call_threshold = slow_call_threshold
+        self.slow_calls: Deque[CallTiming] = deque(maxlen=slow_calls)
+        self._profiling = asyncio.Lock()
+
+    @contextlib.contextmanager
+    def tool_call(
+        self, server: str, tool: str, arguments: Dict[str, Any]
+    ) -> Iterator[CallTiming]:
+        """Time a tool call; calls nested in one are timed as part of it"""
+        current = _current_call.get()
+        if current is not None or not self.enabled:
+            yield current or CallTiming(server, tool, arguments)
+            return
+
+        call = CallTiming(server, tool, arguments)
+        token = _current_call.set(call)
+        started = time.perf_counter()
+        try:
+            yield call
+        finally:
+            call.total = time.perf_counter() - started
+            _current_call.reset(token)
+            if call.total >= self.slow_call_threshold:
+                self.slow_calls.append(call)
+
+    def record_upstream(self, elapsed: float) -> None:
+        """Add an upstream request to the current tool call's breakdown"""
+        call = _current_call.get()
+        if call is not None:
+            call.upstream += elapsed
+            call.upstream_requests += 1
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "loop": self.monitor.stats(),
+            "slow_call_threshold_ms": self.slow_call_threshold * 1000,
+            "slow_calls": [
+                call.as_dict()
+                for call in sorted(self.slow_calls, key=lambda c: -c.total)
+            ],
+        }
+
+    @property
+    def profiling(self) -> bool:
+        return self._profiling.locked()
+
+    async def profile(
+        self, seconds: float, mode: str = "sample", interval: float = 0.005
+    ) -> str:
+        """Profile the event loop thread for ``seconds``.
+
+        "sample" returns folded stacks (one ``frame;frame;... count`` line per
+        stack, the input of flamegraph tools) sampled every ``interval``
+        seconds from a separate thread. The sampler needs the GIL, so code
+        holding it is seen at the switch interval (5 ms) at best; calls much
+        shorter than that are undercounted. "cprofile" returns cProfile statistics
+        of everything that ran on the loop in the window; it slows the loop
+        down while it runs.
+        """
+        async with self._profiling:
+            if mode == "cprofile":
+                profiler = cProfile.Profile()
+                profiler.enable()
+                try:
+                    await asyncio.sleep(seconds)
+                finally:
+                    profiler.disable()
+                output = io.StringIO()
+                stats = pstats.Stats(profiler, stream=output)
+                stats.sort_stats("cumulative").print_stats(50)
+                return output.getvalue()
+
+            samples = await asyncio.to_thread(
+                _sample, threading.get_ident(), seconds, interval
+            )
+            return "".join(
+                f"{stack} {count}\n" for stack, count in samples.most_common()
+            )
+
+
+def _sample(thread: int, seconds: float, interval: float) -> Counter:
+    """Count the stacks of ``thread`` seen every ``interval`` seconds"""
+    samples: Counter = Counter()
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        frame = sys._current_frames().get(thread)
+        if frame is not None:
+            samples[";".join(_stack(frame))] += 1
+        time.sleep(interval)
+    return samples
+
+
+# Diagnostics of this process
+diagnostics = Diagnostics(
+    settings.diagnostics_enabled,
+    stall_threshold=settings.diagnostics_stall_ms / 1000,
+    slow_call_threshold=settings.diagnostics_slow_call_ms / 1000,
+    slow_calls=settings.diagnostics_slow_calls,
+)
@@ -0,0 +1,182 @@
+import bisect
+import csv
+import difflib
+import re
+import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Cities known to the default index, most populous first
+CITIES_PATH = Path(__file__).with_name("data") / "cities.csv"
+
+# Country names accepted in place of ISO 3166 codes
+COUNTRY_ALIASES = {
+    "usa": "US",
+    "united states": "US",
+    "america": "US",
+    "uk": "GB",
+    "united kingdom": "GB",
+    "england": "GB",
+    "scotland": "GB",
+    "great britain": "GB",
+    "uae": "AE",
+    "united arab emirates": "AE",
+    "argentina": "AR",
+    "australia": "AU",
+    "austria": "AT",
+    "belgium": "BE",
+    "brazil": "BR",
+    "canada": "CA",
+    "china": "CN",
+    "egypt": "EG",
+    "france": "FR",
+    "germany": "DE",
+    "greece": "GR",
+    "india": "IN",
+    "indonesia": "ID",
+    "ireland": "IE",
+    "italy": "IT",
+    "japan": "JP",
+    "mexico": "MX",
+    "netherlands": "NL",
+    "new zealand": "NZ",
+    "nigeria": "NG",
+    "norway": "NO",
+    "poland": "PL",
+    "portugal": "PT",
+    "russia": "RU",
+    "south africa": "ZA",
+    "south korea": "KR",
+    "korea": "KR",
+    "spain": "ES",
+    "sweden": "SE",
+    "switzerland": "CH",
+    "turkey": "TR",
+}
+
+
+def normalize(text: str) -> str:
+    """Lowercase ASCII form of a place name with punctuation collapsed"""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c)).casefold()
+    text = re.sub(r"[.'’]", "", text)
+    return " ".join(re.sub(r"[^\w]+", " ", text).split())
+
+
+@dataclass(frozen=True, slots=True)
+class Place:
+    name: str
+    country: str
+
+
+class Gazetteer:
+    """Resolves free-text city names to canonical places.
+
+    Names and aliases are matched after normalization. Failing that, a query
+    may be a unique prefix of a place's name (not of an alias) if it has at
+    least ``min_prefix`` characters and covers ``min_coverage`` of the name,
+    or a close misspelling of a name or alias. A query that a known name
+    merely extends or truncates ("Lyons", "Mila") is not a misspelling: it is
+    more likely another place, so it is passed through. Ambiguous names
+    resolve to the first (most populous) place, unless a country is given.
+    Results are memoized, so repeated lookups are a dict access.
+    """
+
+    def __init__(
+        self,
+        places: Iterable[Tuple[Place, Iterable[str]]],
+        min_prefix: int = 5,
+        min_coverage: float = 0.6,
+        cutoff: float = 0.85,
+        max_memo: int = 4096,
+    ):
+        self.min_prefix = min_prefix
+        self.min_coverage = min_coverage
+        self.cutoff = cutoff
+        self.max_memo = max_memo
+        self._names: Dict[str, List[Place]] = {}
+        canonical = set()
+        for place, aliases in places:
+            canonical.add(normalize(place.name))
+            for name in (place.name, *aliases):
+                matches = self._names.setdefault(normalize(name), [])
+                if place not in matches:
+                    matches.append(place)
+        # Canonical names, for prefix lookups
+        self._sorted = sorted(canonical)
+        self._memo: Dict[Tuple[str, Optional[str]], Optional[Place]] = {}
+
+    @classmethod
+    def from_csv(cls, path: Path = CITIES_PATH, **kwargs) -> "Gazetteer":
+        """Index a CSV file with name, country and "|"-separated aliases"""
+        with open(path, newline="", encoding="utf-8") as f:
+            places = [
+                (
+                    Place(row["name"], row["country"]),
+                    [alias for alias in row["aliases"].split("|") if alias],
+                )
+                for row in csv.DictReader(f)
+            ]
+        return cls(places, **kwargs)
+
+    def resolve(self, city: str, country: Optional[str] = None) -> Optional[Place]:
+        """The place ``city`` (in ``country``, if given) refers to, if known"""
+        key = (normalize(city), country.upper() if country else None)
+        if key not in self._memo:
+            if len(self._memo) >= self.max_memo:
+                self._memo.clear()
+            self._memo[key] = self._lookup(*key)
+        return self._memo[key]
+
+    def _lookup(self, name: str, country: Optional[str]) -> Optional[Place]:
+        def pick(places: Iterable[Place]) -> Optional[Place]:
+            return next((p for p in places if country in (None, p.country)), None)
+
+        place = pick(self._names.get(name, ()))
+        if place is not None or not name:
+            return place
+
+        if len(name) >= self.min_prefix:
+            # Place -> the canonical name the query is a prefix of
+            candidates: Dict[Place, str] = {}
+            for other in self._sorted[bisect.bisect_left(self._sorted, name) :]:
+                if not other.startswith(name):
+                    break
+                for p in self._names[other]:
+                    if country in (None, p.country) and normalize(p.name) == other:
+                        candidates[p] = other
+            if len(candidates) == 1:
+                ((place, other),) = candidates.items()
+                if len(name) >= self.min_coverage * len(other):
+                    return place
+
+        for match in difflib.get_close_matches(
+            name, self._names, n=3, cutoff=self.cutoff
+        ):
+            if match.startswith(name) or name.startswith(match):
+                continue
+            place = pick(self._names[match])
+            if place is not None:
+                return place
+        return None
+
+    def canonical(
+        self, city: str, country: Optional[str] = None
+    ) -> Tuple[str, Optional[str]]:
+        """Canonical (city, country code) for a query such as "new york, us".
+
+        Unknown places keep their name, with whitespace and case normalized.
+        """
+        if country is None and "," in city:
+            city, _, country = city.rpartition(",")
+        if country is not None:
+            country = normalize(country)
+            # Unknown country names would only make the upstream lookup fail
+            code = country.upper() if len(country) == 2 else None
+            country = COUNTRY_ALIASES.get(country, code)
+
+        place = self.resolve(city, country)
+        if place is None:
+            return " ".join(city.split()).casefold(), country
+        return place.name, place.country
@@ -0,0 +1,99 @@
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+
+class LatencyTracker:
+    """Recent latencies per upstream endpoint, and the timeouts derived from them.
+
+    Until an endpoint has ``min_samples`` observations the ``default_timeout``
+    is used. After that the timeout is ``multiplier`` times its p99, clamped to
+    ``[min_timeout, max_timeout]``. Timed-out requests are recorded at the
+    timeout, so a slowing upstream raises its own timeout.
+
+    Hedges come from a token bucket: every request adds ``hedge_ratio`` of a
+    token, up to ``hedge_burst``, and every hedge spends one. The ratio thus
+    applies to recent traffic, and a quiet period cannot bank a burst of
+    hedges for the next slowdown.
+    """
+
+    def __init__(
+        self,
+        window: int = 256,
+        min_samples: int = 20,
+        default_timeout: float = 5.0,
+        min_timeout: float = 0.5,
+        max_timeout: float = 10.0,
+        multiplier: float = 2.0,
+        hedge_ratio: float = 0.05,
+        hedge_burst: float = 5.0,
+    ):
+        self.window = window
+        self.min_samples = min_samples
+        self.default_timeout = default_timeout
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.multiplier = multiplier
+        self._samples: Dict[str, Deque[float]] = {}
+        self._sorted: Dict[str, List[float]] = {}
+        self.hedge_ratio = hedge_ratio
+        self.hedge_burst = hedge_burst
+        self._hedge_tokens = 0.0
+
+    def record(self, endpoint: str, seconds: float) -> None:
+        samples = self._samples.get(endpoint)
+        if samples is None:
+            samples = self._samples[endpoint] = deque(maxlen=self.window)
+        samples.append(seconds)
+        self._sorted.pop(endpoint, None)
+
+    def count(self, endpoint: str) -> int:
+        samples = self._samples.get(endpoint)
+        return len(samples) if samples else 0
+
+    def percentile(self, endpoint: str, q: float) -> Optional[float]:
+        """The ``q`` quantile (0-1) of recent latencies, or None without data"""
+        ordered = self._sorted.get(endpoint)
+        if ordered is None:
+            samples = self._samples.get(endpoint)
+            if not samples:
+                return None
+            ordered = self._sorted[endpoint] = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def timeout(self, endpoint: str) -> float:
+        """Timeout to use for the next request to ``endpoint``"""
+        if self.count(endpoint) < self.min_samples:
+            return self.default_timeout
+        p99 = self.percentile(endpoint, 0.99)
+        return min(self.max_timeout, max(self.min_timeout, p99 * self.multiplier))
+
+    def hedge_delay(self, endpoint: str) -> Optional[float]:
+        """How long to wait before hedging, or None without enough data"""
+        if self.count(endpoint) < self.min_samples:
+            return None
+        return self.percentile(endpoint, 0.95)
+
+    def take_hedge(self) -> bool:
+        """Spend a hedge token, if one is available"""
+        if self._hedge_tokens < 1.0:
+            return False
+        self._hedge_tokens -= 1.0
+        return True
+
+    def count_request(self) -> None:
+        self._hedge_tokens = min(
+            self.hedge_burst, self._hedge_tokens + self.hedge_ratio
+        )
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """p50/p95/p99 and current timeout per endpoint"""
+        return {
+            endpoint: {
+                "samples": self.count(endpoint),
+                "p50": self.percentile(endpoint, 0.5),
+                "p95": self.percentile(endpoint, 0.95),
+                "p99": self.percentile(endpoint, 0.99),
+                "timeout": self.timeout(endpoint),
+            }
+            for endpoint in self._samples
+        }
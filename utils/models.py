@@ -0,0 +1,374 @@
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Optional
+
+
+@dataclass(slots=True)
+class Model:
+    """Base for compact, slotted response models.
+
+    Models are returned directly from tools and encoded by utils.serialization.
+    Item access (``model["field"]``) is kept so callers that treated tool
+    results as dicts keep working.
+    """
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+
+# Weather (OpenWeatherMap)
+
+
+@dataclass(slots=True)
+class CurrentWeather(Model):
+    city: str
+    country: str
+    temperature: float
+    feels_like: float
+    humidity: int
+    pressure: int
+    description: str
+    wind_speed: float
+    visibility: Any
+    units: str
+
+    @classmethod
+    def from_api(cls, data: Dict[str, Any], units: str) -> "CurrentWeather":
+        main = data["main"]
+        return cls(
+            city=data["name"],
+            country=data["sys"]["country"],
+            temperature=main["temp"],
+            feels_like=main["feels_like"],
+            humidity=main["humidity"],
+            pressure=main["pressure"],
+            description=data["weather"][0]["description"],
+            wind_speed=data["wind"]["speed"],
+            visibility=data.get("visibility", "N/A"),
+            units=units,
+        )
+
+
+@dataclass(slots=True)
+class ForecastEntry(Model):
+    datetime: str
+    temperature: float
+    description: str
+    humidity: int
+    wind_speed: float
+
+    @classmethod
+    def from_api(cls, item: Dict[str, Any]) -> "ForecastEntry":
+        main = item["main"]
+        return cls(
+            datetime=item["dt_txt"],
+            temperature=main["temp"],
+            description=item["weather"][0]["description"],
+            humidity=main["humidity"],
+            wind_speed=item["wind"]["speed"],
+        )
+
+
+@dataclass(slots=True)
+class Forecast(Model):
+    city: str
+    country: str
+    forecasts: List[ForecastEntry]
+    units: str
+
+    @classmethod
+    def from_api(cls, data: Dict[str, Any], units: str, limit: int) -> "Forecast":
+        return cls(
+            city=data["city"]["name"],
+            country=data["city"]["country"],
+            forecasts=[ForecastEntry.from_api(item) for item in data["list"][:limit]],
+            units=units,
+        )
+
+
+@dataclass(slots=True)
+class WeatherAtCoordinates(Model):
+    city: str
+    country: str
+    location: str
+    coordinates: Dict[str, float]
+    temperature: float
+    feels_like: float
+    humidity: int
+    description: str
+    wind_speed: float
+    units: str
+
+    @classmethod
+    def from_api(
+        cls, data: Dict[str, Any], lat: float, lon: float, units: str
+    ) -> "WeatherAtCoordinates":
+        main = data["main"]
+        return cls(
+            city=data["name"],
+            country=data["sys"]["country"],
+            location=f"{data['name']}, {data['sys']['country']}",
+            coordinates={"lat": lat, "lon": lon},
+            temperature=main["temp"],
+            feels_like=main["feels_like"],
+            humidity=main["humidity"],
+            description=data["weather"][0]["description"],
+            wind_speed=data["wind"]["speed"],
+            units=units,
+        )
+
+
+# News (newsapi.org)
+
+
+@dataclass(slots=True)
+class Article(Model):
+    title: str
+    description: Optional[str]
+    url: str
+    source: str
+    author: Optional[str]
+    published_at: str
+    url_to_image: Optional[str]
+
+    @classmethod
+    def from_api(cls, article: Dict[str, Any]) -> "Article":
+        return cls(
+            title=article["title"],
+            description=article["description"],
+            url=article["url"],
+            source=article["source"]["name"],
+            author=article.get("author"),
+            published_at=article["publishedAt"],
+            url_to_image=article.get("urlToImage"),
+        )
+
+    @classmethod
+    def list_from_api(cls, data: Dict[str, Any]) -> List["Article"]:
+        return [cls.from_api(article) for article in data["articles"]]
+
+
+@dataclass(slots=True)
+class Headlines(Model):
+    total_results: int
+    articles: List[Article]
+    country: str
+    category: Optional[str]
+
+    @classmethod
+    def from_api(
+        cls, data: Dict[str, Any], country: str, category: Optional[str]
+    ) -> "Headlines":
+        return cls(
+            total_results=data["totalResults"],
+            articles=Article.list_from_api(data),
+            country=country,
+            category=category,
+        )
+
+
+@dataclass(slots=True)
+class NewsSearch(Model):
+    total_results: int
+    articles: List[Article]
+    query: str
+    sort_by: str
+    language: str
+
+    @classmethod
+    def from_api(
+        cls, data: Dict[str, Any], query: str, sort_by: str, language: str
+    ) -> "NewsSearch":
+        return cls(
+            total_results=data["totalResults"],
+            articles=Article.list_from_api(data),
+            query=query,
+            sort_by=sort_by,
+            language=language,
+        )
+
+
+# Currency (exchangerate-api.com)
+
+
+@dataclass(slots=True)
+class ExchangeRates(Model):
+    base_currency: str
+    last_updated: str
+    next_update: str
+    exchange_rates: Dict[str, float]
+
+    @classmethod
+    def from_api(cls, data: Dict[str, Any]) -> "ExchangeRates":
+        return cls(
+            base_currency=data["base_code"],
+            last_updated=data["time_last_update_utc"],
+            next_update=data["time_next_update_utc"],
+            exchange_rates=data["conversion_rates"],
+        )
+
+
+@dataclass(slots=True)
+class Conversion(Model):
+    from_currency: str
+    to_currency: str
+    exchange_rate: float
+    original_amount: float
+    converted_amount: float
+    last_updated: str
+
+    @classmethod
+    def from_api(cls, data: Dict[str, Any], amount: float) -> "Conversion":
+        return cls(
+            from_currency=data["base_code"],
+            to_currency=data["target_code"],
+            exchange_rate=data["conversion_rate"],
+            original_amount=amount,
+            converted_amount=data["conversion_result"],
+            last_updated=data["time_last_update_utc"],
+        )
+
+
+@dataclass(slots=True)
+class SupportedCurrencies(Model):
+    total_currencies: int
+    currencies: Dict[str, str]
+
+    @classmethod
+    def from_api(cls, data: Dict[str, Any]) -> "SupportedCurrencies":
+        currencies = {code: name for code, name in data["supported_codes"]}
+        return cls(total_currencies=len(currencies), currencies=currencies)
+
+
+@dataclass(slots=True)
+class HistoricalRates(Model):
+    base_currency: str
+    target_currency: str
+    date: str
+    exchange_rate: Optional[float]
+    all_rates: Optional[Dict[str, float]]
+
+    @classmethod
+    def from_api(
+        cls, data: Dict[str, Any], target_currency: str, date: str
+    ) -> "HistoricalRates":
+        rates = data["conversion_rates"]
+        return cls(
+            base_currency=data["base_code"],
+            target_currency=target_currency,
+            date=date,
+            exchange_rate=rates.get(target_currency),
+            all_rates=rates if target_currency == "ALL" else None,
+        )
+
+
+# Quotes (quotable.io) and facts (uselessfacts.jsph.pl)
+
+
+@dataclass(slots=True)
+class Quote(Model):
+    quote: str
+    author: str
+    length: int
+    tags: List[str]
+
+    @classmethod
+    def from_api(cls, quote: Dict[str, Any]) -> "Quote":
+        return cls(
+            quote=quote["content"],
+            author=quote["author"],
+            length=quote["length"],
+            tags=quote["tags"],
+        )
+
+    @classmethod
+    def list_from_api(cls, data: Dict[str, Any]) -> List["Quote"]:
+        return [cls.from_api(quote) for quote in data["results"]]
+
+
+@dataclass(slots=True)
+class QuoteCategory(Model):
+    name: str
+    quote_count: int
+
+    @classmethod
+    def from_api(cls, tag: Dict[str, Any]) -> "QuoteCategory":
+        return cls(name=tag["name"], quote_count=tag["quoteCount"])
+
+
+@dataclass(slots=True)
+class QuoteCategories(Model):
+    total_categories: int
+    categories: List[QuoteCategory]
+
+    @classmethod
+    def from_api(cls, data: List[Dict[str, Any]]) -> "QuoteCategories":
+        categories = [QuoteCategory.from_api(tag) for tag in data]
+        categories.sort(key=lambda category: category.quote_count, reverse=True)
+        return cls(total_categories=len(categories), categories=categories)
+
+
+@dataclass(slots=True)
+class QuotesByCategory(Model):
+    category: str
+    total_quotes: int
+    quotes: List[Quote]
+
+    @classmethod
+    def from_api(cls, data: Dict[str, Any], category: str) -> "QuotesByCategory":
+        return cls(
+            category=category,
+            total_quotes=data["totalCount"],
+            quotes=Quote.list_from_api(data),
+        )
+
+
+@dataclass(slots=True)
+class QuotesByAuthor(Model):
+    author: str
+    total_quotes: int
+    quotes: List[Quote]
+
+    @classmethod
+    def from_api(cls, data: Dict[str, Any], author: str) -> "QuotesByAuthor":
+        return cls(
+            author=author,
+            total_quotes=data["totalCount"],
+            quotes=Quote.list_from_api(data),
+        )
+
+
+@dataclass(slots=True)
+class QuoteSearch(Model):
+    query: str
+    total_results: int
+    quotes: List[Quote]
+
+    @classmethod
+    def from_api(cls, data: Dict[str, Any], query: str) -> "QuoteSearch":
+        return cls(
+            query=query,
+            total_results=data["totalCount"],
+            quotes=Quote.list_from_api(data),
+        )
+
+
+@dataclass(slots=True)
+class Fact(Model):
+    fact: str
+    source: str
+    language: str
+
+    @classmethod
+    def from_api(cls, data: Dict[str, Any]) -> "Fact":
+        return cls(
+            fact=data["text"], source=data.get("source", "Unknown"), language="en"
+        )
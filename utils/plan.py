@@ -0,0 +1,189 @@
+import asyncio
+import contextlib
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from utils.admission import AdmissionController
+from utils.registry import ServerRegistry
+from utils.usage import UsageTracker, current_client
+
+# Largest number of steps accepted in one plan
+MAX_STEPS = 32
+
+
+class PlanStep(BaseModel):
+    """One tool invocation in a plan.
+
+    Argument values of the form ``{"$ref": "<step id>.<path>"}`` are replaced by
+    (part of) another step's result, e.g. ``{"$ref": "news.articles.0.title"}``.
+    Referenced steps are implicit dependencies.
+    """
+
+    id: str
+    server: str
+    tool: str
+    arguments: Dict[str, Any] = Field(default_factory=dict)
+    depends_on: List[str] = Field(default_factory=list)
+
+
+class Plan(BaseModel):
+    steps: List[PlanStep] = Field(min_length=1, max_length=MAX_STEPS)
+
+
+class PlanError(ValueError):
+    """Raised for plans that cannot be executed (bad references, cycles, ...)"""
+
+
+class StepFailed(Exception):
+    pass
+
+
+def _refs(value: Any) -> List[str]:
+    """Step ids referenced by an argument value"""
+    if isinstance(value, dict):
+        if set(value) == {"$ref"} and isinstance(value["$ref"], str):
+            return [value["$ref"].split(".", 1)[0]]
+        return [ref for item in value.values() for ref in _refs(item)]
+    if isinstance(value, list):
+        return [ref for item in value for ref in _refs(item)]
+    return []
+
+
+def _lookup(results: Dict[str, Any], ref: str) -> Any:
+    step_id, *path = ref.split(".")
+    value = results[step_id]
+    for part in path:
+        try:
+            if isinstance(value, (list, tuple)):
+                value = value[int(part)]
+            else:
+                value = value[part]
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise StepFailed(f"Cannot resolve reference {ref!r}") from None
+    return value
+
+
+def _resolve(value: Any, results: Dict[str, Any]) -> Any:
+    if isinstance(value, dict):
+        if set(value) == {"$ref"} and isinstance(value["$ref"], str):
+            return _lookup(results, value["$ref"])
+        return {key: _resolve(item, results) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_resolve(item, results) for item in value]
+    return value
+
+
+def dependencies(plan: Plan, registry: ServerRegistry) -> Dict[str, List[str]]:
+    """Validate a plan and return the dependencies of each step"""
+    steps = {step.id: step for step in plan.steps}
+    if len(steps) != len(plan.steps):
+        raise PlanError("Step ids must be unique")
+
+    enabled = {spec.name for spec in registry.enabled}
+    graph: Dict[str, List[str]] = {}
+    for step in plan.steps:
+        if step.server not in enabled:
+            raise PlanError(f"Step {step.id!r}: unknown server {step.server!r}")
+        deps = list(dict.fromkeys(step.depends_on + _refs(step.arguments)))
+        for dep in deps:
+            if dep not in steps:
+                raise PlanError(f"Step {step.id!r} depends on unknown step {dep!r}")
+        graph[step.id] = deps
+
+    # Kahn's algorithm: every step must eventually have its dependencies met
+    remaining = {step_id: len(deps) for step_id, deps in graph.items()}
+    ready = [step_id for step_id, count in remaining.items() if count == 0]
+    visited = 0
+    while ready:
+        done = ready.pop()
+        visited += 1
+        for step_id, deps in graph.items():
+            if done in deps:
+                remaining[step_id] -= 1
+                if remaining[step_id] == 0:
+                    ready.append(step_id)
+    if visited != len(graph):
+        raise PlanError("Plan contains a dependency cycle")
+
+    return graph
+
+
+async def execute_plan(
+    plan: Plan,
+    registry: ServerRegistry,
+    client: Optional[str] = None,
+    usage: Optional[UsageTracker] = None,
+    admission: Optional[AdmissionController] = None,
+) -> Dict[str, Any]:
+    """Run every step as soon as its dependencies finish.
+
+    Independent steps run concurrently. A step whose dependency failed is
+    skipped. Returns ``{"results": {step_id: {...}}, "elapsed_ms": ...}``.
+
+    Steps go through the same checks as calls to the MCP mounts: with
+    ``usage``, each is a tool call of ``client`` (counted, subject to its
+    quotas and concurrency limit, and charged for its upstream requests), and
+    with ``admission`` each waits for a slot on its server. A step that is
+    refused fails with the reason.
+    """
+    graph = dependencies(plan, registry)
+    steps = {step.id: step for step in plan.steps}
+    finished: Dict[str, asyncio.Future] = {
+        step_id: asyncio.get_running_loop().create_future() for step_id in steps
+    }
+    values: Dict[str, Any] = {}
+    results: Dict[str, Dict[str, Any]] = {}
+
+    @contextlib.asynccontextmanager
+    async def admitted(step: PlanStep) -> AsyncIterator[None]:
+        accounted = None
+        if usage is not None and client is not None:
+            accounted = usage.admit(client, step.tool)
+        try:
+            if admission is not None:
+                async with admission.slot(step.server):
+                    yield
+            else:
+                yield
+        finally:
+            if accounted is not None:
+                usage.exit(accounted)
+
+    async def run(step: PlanStep) -> None:
+        started: Optional[float] = None
+        try:
+            for dep in graph[step.id]:
+                if not await finished[dep]:
+                    raise StepFailed(f"Dependency {dep!r} failed")
+
+            started = time.perf_counter()
+            arguments = _resolve(step.arguments, values)
+            await registry.load(step.server)
+            server = registry.get_server(step.server)
+            async with admitted(step):
+                values[step.id] = await server.run_tool(step.tool, arguments)
+            results[step.id] = {"status": "ok", "result": values[step.id]}
+            finished[step.id].set_result(True)
+        except Exception as e:
+            status = "error" if started is not None else "skipped"
+            results[step.id] = {"status": status, "error": str(e)}
+            finished[step.id].set_result(False)
+        finally:
+            if started is not None:
+                elapsed = (time.perf_counter() - started) * 1000
+                results[step.id]["elapsed_ms"] = round(elapsed, 2)
+
+    started = time.perf_counter()
+    # Steps run in tasks that inherit the client, so their upstream requests
+    # are charged to it
+    token = current_client.set(client if usage is not None else None)
+    try:
+        await asyncio.gather(*(run(step) for step in plan.steps))
+    finally:
+        current_client.reset(token)
+    return {
+        "results": {step.id: results[step.id] for step in plan.steps},
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
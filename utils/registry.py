@@ -0,0 +1,236 @@
+import ast
+import contextlib
+import importlib
+import importlib.util
+import logging
+import pkgutil
+from dataclasses import dataclass
+from importlib.metadata import entry_points
+from typing import TYPE_CHECKING, AsyncIterator, Dict, Iterable, List, Optional
+
+import anyio
+from anyio.abc import TaskGroup, TaskStatus
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+if TYPE_CHECKING:
+    from mcp.server.fastmcp import FastMCP
+
+logger = logging.getLogger(__name__)
+
+# Entry point group installed distributions use to provide extra servers,
+# e.g. ``stocks = "mcp_stocks.server:mcp"``
+ENTRY_POINT_GROUP = "fastapi_multi_server_mcp.servers"
+
+
+@dataclass(frozen=True)
+class ServerSpec:
+    """Where to find an MCP server and where to mount it"""
+
+    name: str
+    module: str
+    description: str
+    attr: str = "mcp"
+    mount_path: Optional[str] = None
+
+    @property
+    def path(self) -> str:
+        return self.mount_path or f"/{self.name}"
+
+
+def _read_spec(name: str, module: str, attr: str, path: str) -> Optional[ServerSpec]:
+    """Build a spec from a module's source without importing it.
+
+    The first docstring line becomes the description and a top-level
+    ``MOUNT_PATH = "..."`` overrides the mount path. Returns None when the
+    module does not define ``attr``.
+    """
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    assigned: Dict[str, ast.expr] = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    assigned[target.id] = node.value
+        elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+            assigned[node.target.id] = node.value
+
+    if attr not in assigned:
+        return None
+
+    mount_path = assigned.get("MOUNT_PATH")
+    docstring = ast.get_docstring(tree) or ""
+    return ServerSpec(
+        name=name,
+        module=module,
+        description=docstring.strip().split("\n")[0],
+        attr=attr,
+        mount_path=mount_path.value if isinstance(mount_path, ast.Constant) else None,
+    )
+
+
+def discover_servers(
+    package: str = "servers", group: str = ENTRY_POINT_GROUP
+) -> List[ServerSpec]:
+    """Find MCP servers without importing them.
+
+    Every public module in ``package`` that assigns a top-level ``mcp`` is
+    registered under its module name. Installed distributions can add servers
+    through the ``group`` entry point group.
+    """
+    specs: Dict[str, ServerSpec] = {}
+
+    package_spec = importlib.util.find_spec(package)
+    if package_spec is None or package_spec.submodule_search_locations is None:
+        raise ValueError(f"{package!r} is not a package")
+
+    for info in pkgutil.iter_modules(package_spec.submodule_search_locations):
+        if info.ispkg or info.name.startswith("_"):
+            continue
+        module = f"{package}.{info.name}"
+        module_spec = importlib.util.find_spec(module)
+        spec = _read_spec(info.name, module, "mcp", module_spec.origin)
+        if spec is not None:
+            specs[spec.name] = spec
+
+    for entry_point in entry_points(group=group):
+        if entry_point.name in specs:
+            logger.warning(
+                "Ignoring entry point %r: a server with that name already exists",
+                entry_point.value,
+            )
+            continue
+        module, _, attr = entry_point.value.partition(":")
+        module_spec = importlib.util.find_spec(module)
+        origin = module_spec.origin if module_spec else None
+        spec = None
+        if origin and origin.endswith(".py"):
+            spec = _read_spec(entry_point.name, module, attr or "mcp", origin)
+        specs[entry_point.name] = spec or ServerSpec(
+            entry_point.name, module, "", attr=attr or "mcp"
+        )
+
+    return list(specs.values())
+
+
+class LazyServer:
+    """ASGI app that imports and starts its MCP server on the first request"""
+
+    def __init__(self, registry: "ServerRegistry", name: str):
+        self.registry = registry
+        self.name = name
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        app = await self.registry.load(self.name)
+        await app(scope, receive, send)
+
+
+class ServerRegistry:
+    """Mounts the enabled MCP servers and manages their session managers.
+
+    Server modules are only imported, and their session managers only started,
+    when a server is first used (or at startup when ``lazy`` is False). Every
+    server in ``specs`` is enabled unless ``enabled`` names a subset. With
+    ``json_response`` every server answers with JSON bodies instead of SSE.
+    """
+
+    def __init__(
+        self,
+        specs: Iterable[ServerSpec],
+        enabled: Optional[Iterable[str]] = None,
+        lazy: bool = True,
+        json_response: bool = False,
+    ):
+        self.specs: Dict[str, ServerSpec] = {spec.name: spec for spec in specs}
+        enabled = list(enabled or self.specs)
+        unknown = [name for name in enabled if name not in self.specs]
+        if unknown:
+            raise ValueError(
+                f"Unknown MCP servers: {', '.join(unknown)}. "
+                f"Available: {', '.join(self.specs)}"
+            )
+
+        self.enabled: List[ServerSpec] = [self.specs[name] for name in enabled]
+        self.lazy = lazy
+        self.json_response = json_response
+        self._apps: Dict[str, ASGIApp] = {}
+        self._servers: Dict[str, "FastMCP"] = {}
+        self._locks: Dict[str, anyio.Lock] = {}
+        self._task_group: Optional[TaskGroup] = None
+
+    @property
+    def loaded(self) -> List[str]:
+        return list(self._apps)
+
+    def mount(self, app: FastAPI) -> None:
+        """Mount every enabled server on the application"""
+        for spec in self.enabled:
+            app.mount(spec.path, LazyServer(self, spec.name))
+
+    def get_server(self, name: str) -> Optional["FastMCP"]:
+        """Return the server instance if it has already been loaded"""
+        return self._servers.get(name)
+
+    async def load(self, name: str) -> ASGIApp:
+        """Import the server, start its session manager and return its ASGI app"""
+        app = self._apps.get(name)
+        if app is not None:
+            return app
+
+        if self._task_group is None:
+            raise RuntimeError("Server registry is not running. Use registry.run().")
+
+        lock = self._locks.setdefault(name, anyio.Lock())
+        async with lock:
+            if name not in self._apps:
+                spec = self.specs[name]
+                module = importlib.import_module(spec.module)
+                server: "FastMCP" = getattr(module, spec.attr)
+                # A session manager can only run once, so start from a fresh one
+                # in case the registry was restarted
+                server._session_manager = None
+                if self.json_response:
+                    server.settings.json_response = True
+                app = server.streamable_http_app()
+                await self._task_group.start(self._serve, server)
+                self._servers[name] = server
+                self._apps[name] = app
+                logger.info("Started MCP server %r at %s", name, spec.path)
+
+        return self._apps[name]
+
+    async def _serve(
+        self,
+        server: "FastMCP",
+        *,
+        task_status: TaskStatus[None] = anyio.TASK_STATUS_IGNORED,
+    ) -> None:
+        from utils.server import FastMCPServer
+
+        # FastMCPServer also closes its upstream API clients on shutdown
+        if isinstance(server, FastMCPServer):
+            running = server.running()
+        else:
+            running = server.session_manager.run()
+
+        async with running:
+            task_status.started()
+            await anyio.sleep_forever()
+
+    @contextlib.asynccontextmanager
+    async def run(self) -> AsyncIterator[None]:
+        """Keep loaded servers running for the lifetime of the application"""
+        async with anyio.create_task_group() as tg:
+            self._task_group = tg
+            try:
+                if not self.lazy:
+                    for spec in self.enabled:
+                        await self.load(spec.name)
+                yield
+            finally:
+                tg.cancel_scope.cancel()
+                self._task_group = None
+                self._apps.clear()
+                self._servers.clear()
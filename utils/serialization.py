@@ -0,0 +1,47 @@
+import dataclasses
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised when orjson is not installed
+    orjson = None
+
+
+# Name of the JSON backend in use ("orjson" or "json")
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def _default(obj: Any) -> Any:
+    """Fallback for objects the stdlib encoder cannot handle"""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj)}
+    return str(obj)
+
+
+def loads(data: Union[bytes, bytearray, str]) -> Any:
+    """Decode a JSON document, using orjson when it is available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Encode an object to UTF-8 JSON bytes, using orjson when it is available"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=str, option=option)
+    return json.dumps(
+        obj,
+        default=_default,
+        ensure_ascii=False,
+        indent=2 if indent else None,
+        separators=None if indent else (",", ":"),
+    ).encode()
+
+
+def dumps_str(obj: Any, indent: bool = False) -> str:
+    """Encode an object to a JSON string"""
+    return dumps(obj, indent=indent).decode()
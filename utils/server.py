@@ -0,0 +1,66 @@
+import contextlib
+import dataclasses
+import time
+from typing import Any, AsyncIterator, Dict, Iterable, Sequence
+
+import anyio
+from mcp.server.fastmcp import FastMCP
+
+# Private helper and call_tool signature of mcp 1.9.x; pyproject.toml caps mcp
+# below 1.10 so a release that changes them is not picked up silently
+from mcp.server.fastmcp.server import _convert_to_content
+from mcp.types import EmbeddedResource, ImageContent, TextContent
+from utils.api_clients import APIClient
+from utils.diagnostics import diagnostics
+from utils.serialization import dumps_str
+
+
+class FastMCPServer(FastMCP):
+    """FastMCP server that serializes tool results with the fast JSON path.
+
+    The upstream API clients passed as ``clients`` are closed when the server
+    stops running.
+    """
+
+    def __init__(self, *args: Any, clients: Iterable[APIClient] = (), **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.clients = list(clients)
+
+    @contextlib.asynccontextmanager
+    async def running(self) -> AsyncIterator[None]:
+        """Run the session manager and close the API clients afterwards"""
+        try:
+            async with self.session_manager.run():
+                yield
+        finally:
+            with anyio.CancelScope(shield=True):
+                for client in self.clients:
+                    await client.aclose()
+
+    async def run_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
+        """Run a tool and return its raw (unserialized) result"""
+        context = self.get_context()
+        with diagnostics.tool_call(self.name, name, arguments):
+            return await self._tool_manager.call_tool(name, arguments, context=context)
+
+    async def call_tool(
+        self, name: str, arguments: Dict[str, Any]
+    ) -> Sequence[TextContent | ImageContent | EmbeddedResource]:
+        """Call a tool by name and convert its result to MCP content"""
+        with diagnostics.tool_call(self.name, name, arguments) as call:
+            result = await self.run_tool(name, arguments)
+            started = time.perf_counter()
+            content = to_content(result)
+            call.serialize = time.perf_counter() - started
+        return content
+
+
+def to_content(result: Any) -> Sequence[TextContent | ImageContent | EmbeddedResource]:
+    """Convert a tool result to MCP content, encoding dicts with the fast JSON path"""
+    if isinstance(result, dict) or (
+        dataclasses.is_dataclass(result) and not isinstance(result, type)
+    ):
+        return [TextContent(type="text", text=dumps_str(result, indent=True))]
+
+    # Strings, images and content objects keep FastMCP's own conversion
+    return _convert_to_content(result)
@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Seconds a call waits for another worker's write lock. Calls run on the event
+# loop, so keep this short: a busy store is treated as a miss.
+BUSY_TIMEOUT = 0.05
+
+# Seconds between sweeps of expired entries
+PURGE_INTERVAL = 60.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value BLOB,
+    counter INTEGER NOT NULL DEFAULT 0,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID
+"""
+
+
+# Both CASE expressions see the row's old expires_at
+_INCR = """
+INSERT INTO entries (namespace, key, counter, expires_at)
+VALUES (:namespace, :key, :amount, :expires_at)
+ON CONFLICT (namespace, key) DO UPDATE SET
+    counter = CASE WHEN expires_at > :now
+        THEN counter + :amount ELSE :amount END,
+    expires_at = CASE WHEN expires_at > :now
+        THEN expires_at ELSE :expires_at END
+RETURNING counter
+"""
+
+
+class SharedStore:
+    """Key/value store and counters shared by every worker process.
+
+    Backed by a SQLite database in WAL mode, so reads never block and each
+    operation is a single short transaction. Put the file on a local (ideally
+    in-memory, e.g. ``/dev/shm``) filesystem. The store is best effort: when
+    the database is busy, ``get`` misses and ``set`` is skipped.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._connect().execute(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path, timeout=BUSY_TIMEOUT, isolation_level=None
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            self._local.conn = conn
+        return conn
+
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        """Return a stored value, or None if it is missing or expired"""
+        entry = self.get_with_expiry(namespace, key)
+        return entry[0] if entry else None
+
+    def get_with_expiry(self, namespace: str, key: str) -> Optional[tuple]:
+        """Return ``(value, expires_at)`` for a live entry, or None"""
+        try:
+            row = self._connect().execute(
+                "SELECT value, expires_at FROM entries "
+                "WHERE namespace = ? AND key = ? AND expires_at > ?",
+                (namespace, key, time.time()),
+            ).fetchone()
+        except sqlite3.OperationalError as e:
+            logger.debug("Shared store read of %s %s failed: %s", namespace, key, e)
+            return None
+        return (row[0], row[1]) if row else None
+
+    def set(self, namespace: str, key: str, value: bytes, ttl: float) -> None:
+        """Store a value for ``ttl`` seconds"""
+        try:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO entries (namespace, key, value, expires_at) "
+                "VALUES (?, ?, ?, ?)",
+                (namespace, key, value, time.time() + ttl),
+            )
+        except sqlite3.OperationalError as e:
+            logger.debug("Shared store write of %s %s failed: %s", namespace, key, e)
+
+    def incr(
+        self, namespace: str, key: str, amount: int = 1, ttl: float = 60.0
+    ) -> Optional[int]:
+        """Atomically add to a counter that resets ``ttl`` seconds after creation.
+
+        Returns the new count, or None if the store was busy.
+        """
+        now = time.time()
+        try:
+            row = self._connect().execute(
+                _INCR,
+                {
+                    "namespace": namespace,
+                    "key": key,
+                    "amount": amount,
+                    "now": now,
+                    "expires_at": now + ttl,
+                },
+            ).fetchone()
+        except sqlite3.OperationalError as e:
+            logger.debug("Shared store update of %s %s failed: %s", namespace, key, e)
+            return None
+        return row[0]
+
+    def purge(self) -> int:
+        """Delete expired entries and return how many were removed"""
+        cursor = self._connect().execute(
+            "DELETE FROM entries WHERE expires_at <= ?", (time.time(),)
+        )
+        return cursor.rowcount
+
+    async def run(self, interval: float = PURGE_INTERVAL) -> None:
+        """Purge expired entries every ``interval`` seconds until cancelled"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.purge)
+            except Exception:
+                logger.exception("Failed to purge the shared store")
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+_store: Optional[SharedStore] = None
+
+
+def shared_store() -> Optional[SharedStore]:
+    """The store shared by all workers, or None when running a single process"""
+    global _store
+    if _store is None and settings.shared_state_path:
+        _store = SharedStore(settings.shared_state_path)
+    return _store
@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from utils.cache import CACHES, TTLCache
+from utils.serialization import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+# (cache name, key, expires_at, arguments, value)
+Entry = Tuple[str, str, float, Dict[str, Any], Any]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    cache TEXT NOT NULL,
+    key TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    arguments BLOB NOT NULL,
+    value BLOB NOT NULL,
+    PRIMARY KEY (cache, key)
+) WITHOUT ROWID
+"""
+
+
+class CacheSnapshot:
+    """Persists the tool caches to a local SQLite file across restarts.
+
+    ``open()`` only reads the index of live keys; values are decoded the
+    first time a cache misses on them, with their original expiry. ``save()``
+    writes every live entry and drops expired ones. Values are stored as JSON
+    (so the file cannot carry code) and come back as plain dicts, like entries
+    read from the SharedStore.
+    """
+
+    def __init__(self, path: str, caches: Optional[Dict[str, TTLCache]] = None):
+        self.path = path
+        self.caches = CACHES if caches is None else caches
+        self._index: Set[Tuple[str, str]] = set()
+        # Guards the writer connection, used by save() from a worker thread
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        # Separate connection for load() on the event loop: WAL lets it read
+        # while a save is writing, so a cache miss never waits for the writer
+        self._reader: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(
+                self.path, timeout=5.0, isolation_level=None, check_same_thread=False
+            )
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SCHEMA)
+        return self._conn
+
+    def open(self) -> int:
+        """Index the live entries of the snapshot and return how many there are"""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT cache, key FROM entries WHERE expires_at > ?", (time.time(),)
+            )
+            self._index = {(cache, key) for cache, key in rows}
+        return len(self._index)
+
+    def load(
+        self, cache: str, key: str
+    ) -> Optional[Tuple[float, Any, Dict[str, Any]]]:
+        """Return ``(expires_at, value, arguments)`` for a live snapshot entry"""
+        if (cache, key) not in self._index:
+            return None
+        self._index.discard((cache, key))
+        # open() has created the file, so the reader can connect directly
+        if self._reader is None:
+            self._reader = sqlite3.connect(self.path, timeout=0.05)
+        try:
+            row = self._reader.execute(
+                "SELECT expires_at, value, arguments FROM entries "
+                "WHERE cache = ? AND key = ? AND expires_at > ?",
+                (cache, key, time.time()),
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("Cannot read snapshot entry %s %s: %s", cache, key, e)
+            return None
+        if row is None:
+            return None
+        try:
+            return row[0], loads(row[1]), loads(row[2])
+        except Exception as e:
+            # e.g. an entry written by an older release
+            logger.warning("Ignoring snapshot entry %s %s: %s", cache, key, e)
+            return None
+
+    def collect(self) -> List[Entry]:
+        """Live entries of every cache (call from the event loop thread)"""
+        return [
+            (name, key, expires_at, cache.arguments(key) or {}, value)
+            for name, cache in list(self.caches.items())
+            for key, expires_at, value in cache.items()
+        ]
+
+    def write(self, entries: List[Entry]) -> int:
+        """Encode and store collected entries, dropping expired ones"""
+        rows = []
+        for name, key, expires_at, arguments, value in entries:
+            try:
+                rows.append((name, key, expires_at, dumps(arguments), dumps(value)))
+            except Exception as e:
+                logger.warning("Cannot snapshot %s %s: %s", name, key, e)
+
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN")
+            try:
+                conn.execute(
+                    "DELETE FROM entries WHERE expires_at <= ?", (time.time(),)
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO entries "
+                    "(cache, key, expires_at, arguments, value) VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def save(self) -> int:
+        """Write every live cache entry to the snapshot and return the count"""
+        return self.write(self.collect())
+
+    async def run(self, interval: float) -> None:
+        """Save a snapshot every ``interval`` seconds until cancelled"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.write, self.collect())
+            except Exception:
+                logger.exception("Failed to save cache snapshot")
+
+    def close(self) -> None:
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
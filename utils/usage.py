@@ -0,0 +1,300 @@
+import hashlib
+import logging
+import time
+from collections import Counter, OrderedDict
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from utils.asgi import buffer_body, parse_jsonrpc, send_jsonrpc_error, server_for
+from utils.config import settings
+from utils.shared_state import shared_store
+
+logger = logging.getLogger(__name__)
+
+# Client on whose behalf the current request runs (None for background work
+# such as cache warming, which is never subject to quotas)
+current_client: ContextVar[Optional[str]] = ContextVar("client", default=None)
+
+# Clients that cannot get an entry of their own (every other entry is busy)
+# are counted together under this ID
+OTHER_CLIENTS = "(other)"
+
+# Upstream requests made outside any client's request, e.g. by the warmer
+INTERNAL = "(internal)"
+
+# JSON-RPC error code returned when a client is over quota
+QUOTA_EXCEEDED = -32001
+
+
+class QuotaExceeded(Exception):
+    """A client used up its quota for a tool or upstream API"""
+
+    def __init__(self, client: str, item: str, retry_after: float):
+        super().__init__(
+            f"Quota exceeded for client {client!r} on {item!r}, "
+            f"retry in {retry_after:.0f}s"
+        )
+        self.retry_after = retry_after
+
+
+def identify(headers: Headers, header: str) -> str:
+    """Client ID from ``header``, else a hash of the bearer token"""
+    client = headers.get(header)
+    if client:
+        return client.strip()[:64]
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        return "token:" + hashlib.sha256(token.encode()).hexdigest()[:12]
+    return "anonymous"
+
+
+class ClientUsage:
+    """Counters of one client"""
+
+    __slots__ = ("calls", "upstream", "rejected", "active", "windows")
+
+    def __init__(self):
+        self.calls: Counter = Counter()
+        self.upstream: Counter = Counter()
+        self.rejected: Counter = Counter()
+        self.active = 0
+        # Item -> (window number, uses), when counted in this process
+        self.windows: Dict[str, Tuple[int, int]] = {}
+
+    def merge(self, other: "ClientUsage") -> None:
+        self.calls.update(other.calls)
+        self.upstream.update(other.upstream)
+        self.rejected.update(other.rejected)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": sum(self.calls.values()),
+            "active": self.active,
+            "tools": dict(self.calls),
+            "upstream": dict(self.upstream),
+            "rejected": dict(self.rejected),
+        }
+
+
+class UsageTracker:
+    """Per-client usage counters and quotas.
+
+    Every tool call and upstream request is counted per client in memory.
+    ``quotas`` maps a client ID (or "*" for any other client) to limits per
+    ``window`` seconds, keyed by "calls" (all tool calls), a tool name or an
+    upstream host. Only limited items are tracked per window; with several
+    workers those windows are counted in the SharedStore, so quotas hold
+    across workers.
+
+    For fair sharing, each client may have at most ``client_concurrency``
+    requests in flight (0: no limit), so a single busy client cannot take all
+    the admission slots. ``priority`` clients are exempt.
+
+    At most ``max_clients`` clients are tracked; the least recently seen idle
+    client makes room for a new one, its counts moving to OTHER_CLIENTS.
+    Clients with quotas of their own and priority clients are always tracked,
+    on top of ``max_clients``.
+    """
+
+    def __init__(
+        self,
+        quotas: Optional[Dict[str, Dict[str, int]]] = None,
+        window: float = 3600.0,
+        client_concurrency: int = 0,
+        priority: Iterable[str] = (),
+        max_clients: int = 1000,
+    ):
+        self.quotas = quotas or {}
+        self.window = window
+        self.client_concurrency = client_concurrency
+        self.priority = set(priority)
+        self.max_clients = max_clients
+        self.pinned = (set(self.quotas) - {"*"}) | self.priority | {INTERNAL}
+        self.clients: "OrderedDict[str, ClientUsage]" = OrderedDict()
+
+    def _record(self, client: str) -> Tuple[str, ClientUsage]:
+        """The client's entry, making room for it if needed"""
+        record = self.clients.get(client)
+        if record is not None:
+            self.clients.move_to_end(client)
+            return client, record
+        tracked = (
+            len(self.clients)
+            - len(self.pinned.intersection(self.clients))
+            - (OTHER_CLIENTS in self.clients)
+        )
+        if client not in self.pinned and tracked >= self.max_clients:
+            if not self._evict():
+                client = OTHER_CLIENTS
+                record = self.clients.get(client)
+                if record is not None:
+                    return client, record
+        record = self.clients[client] = ClientUsage()
+        return client, record
+
+    def _evict(self) -> bool:
+        """Fold the least recently seen idle client into OTHER_CLIENTS"""
+        for client, record in self.clients.items():
+            if client in self.pinned or client == OTHER_CLIENTS or record.active:
+                continue
+            del self.clients[client]
+            other = self.clients.setdefault(OTHER_CLIENTS, ClientUsage())
+            other.merge(record)
+            return True
+        return False
+
+    def _limit(self, client: str, item: str) -> Optional[int]:
+        limits = self.quotas.get(client, self.quotas.get("*", {}))
+        return limits.get(item)
+
+    def _take(
+        self, client: str, record: ClientUsage, item: str, limit: int
+    ) -> Optional[float]:
+        """Count one use of ``item``; seconds until the window resets if over"""
+        now = time.time()
+        window = int(now // self.window)
+        retry_after = (window + 1) * self.window - now
+
+        store = shared_store()
+        used = None
+        if store is not None:
+            used = store.incr(
+                "quota", f"{client}:{item}:{window}", ttl=retry_after + 1
+            )
+        if used is None:
+            # Single worker, or the store is busy: count in this process
+            current, used = record.windows.get(item, (window, 0))
+            used = used + 1 if current == window else 1
+            record.windows[item] = (window, used)
+        return retry_after if used > limit else None
+
+    def _charge(self, client: str, record: ClientUsage, items: Tuple[str, ...]) -> None:
+        for item in items:
+            limit = self._limit(client, item)
+            if limit is None:
+                continue
+            retry_after = self._take(client, record, item, limit)
+            if retry_after is not None:
+                record.rejected[item] += 1
+                raise QuotaExceeded(client, item, retry_after)
+
+    def admit(self, client: str, tool: Optional[str] = None) -> str:
+        """Start a request of ``client``, charging a call of ``tool`` if given.
+
+        Raises QuotaExceeded if the client is at its concurrency limit or over
+        quota; only admitted requests are charged. Returns the ID the request
+        is accounted under, to pass to exit() when it ends.
+        """
+        client, record = self._record(client)
+        if (
+            self.client_concurrency
+            and client not in self.priority
+            and record.active >= self.client_concurrency
+        ):
+            record.rejected["concurrency"] += 1
+            raise QuotaExceeded(client, "concurrency", 1.0)
+        if tool is not None:
+            self._charge(client, record, ("calls", tool))
+            record.calls[tool] += 1
+        record.active += 1
+        return client
+
+    def exit(self, client: str) -> None:
+        """End a request admitted under ``client``"""
+        self.clients[client].active -= 1
+
+    def charge_upstream(self, upstream: str) -> None:
+        """Count an upstream request for the current client.
+
+        Raises QuotaExceeded, without counting it, if the client is over quota.
+        """
+        client = current_client.get()
+        if client is None:
+            self._record(INTERNAL)[1].upstream[upstream] += 1
+            return
+        client, record = self._record(client)
+        self._charge(client, record, (upstream,))
+        record.upstream[upstream] += 1
+
+    def report(self) -> Dict[str, Any]:
+        """Usage per client since startup, and the configured quotas"""
+        return {
+            "window": self.window,
+            "quotas": self.quotas,
+            "client_concurrency": self.client_concurrency,
+            "priority": sorted(self.priority),
+            "clients": {
+                client: record.as_dict() for client, record in self.clients.items()
+            },
+        }
+
+
+# Usage of this process, shared by the MCP mounts and the API clients
+usage = UsageTracker(
+    settings.client_quotas,
+    settings.client_quota_window,
+    client_concurrency=settings.client_concurrency,
+    priority=settings.priority_clients,
+)
+
+
+class UsageMiddleware:
+    """Identifies the client of each MCP request and counts its tool calls.
+
+    Requests over quota, or over the client's concurrency limit, get a 429
+    with Retry-After. The client ID is kept in ``current_client`` so upstream
+    requests made by the tool are charged to it.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        servers: Dict[str, str],
+        tracker: UsageTracker = usage,
+        header: str = "X-Client-ID",
+    ):
+        self.app = app
+        self.servers = servers
+        self.tracker = tracker
+        self.header = header
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or server_for(self.servers, scope["path"]) is None
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        client = identify(Headers(scope=scope), self.header)
+        body, receive = await buffer_body(receive)
+        request = parse_jsonrpc(body)
+        tool = None
+        if request.get("method") == "tools/call":
+            params = request.get("params")
+            tool = params.get("name") if isinstance(params, dict) else None
+            tool = tool or "(other)"
+        try:
+            accounted = self.tracker.admit(client, tool)
+        except QuotaExceeded as e:
+            logger.info("%s", e)
+            await send_jsonrpc_error(
+                send,
+                429,
+                request.get("id"),
+                QUOTA_EXCEEDED,
+                str(e),
+                retry_after=e.retry_after,
+            )
+            return
+
+        token = current_client.set(client)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_client.reset(token)
+            self.tracker.exit(accounted)
@@ -0,0 +1,125 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from utils.cache import CACHES, TTLCache
+from utils.shared_state import shared_store
+
+logger = logging.getLogger(__name__)
+
+
+class CacheWarmer:
+    """Refreshes hot cache entries shortly before they expire.
+
+    Hot keys are the ``top_k`` most requested keys of each cache plus the
+    arguments configured in ``static_keys``. Each cache may refresh at most
+    ``budget`` entries per minute (shared by all workers), so warming never
+    exhausts an upstream quota.
+    """
+
+    def __init__(
+        self,
+        tools: Iterable[str],
+        top_k: int = 10,
+        lead_time: float = 30.0,
+        budget: int = 60,
+        static_keys: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+        interval: float = 5.0,
+        caches: Optional[Dict[str, TTLCache]] = None,
+    ):
+        self.tools = list(tools)
+        self.top_k = top_k
+        self.lead_time = lead_time
+        self.budget = budget
+        self.static_keys = static_keys or {}
+        self.interval = interval
+        self.caches = CACHES if caches is None else caches
+        self._spent: Dict[str, List[float]] = {}
+        self._last_decay = time.monotonic()
+
+    def _take_budget(self, name: str) -> bool:
+        store = shared_store()
+        if store is not None:
+            minute = int(time.time() // 60)
+            spent = store.incr("warm-budget", f"{name}:{minute}", ttl=120)
+            # A busy store spends nothing; the entry is retried next tick
+            return spent is not None and spent <= self.budget
+
+        now = time.monotonic()
+        spent = [t for t in self._spent.get(name, []) if now - t < 60]
+        if len(spent) >= self.budget:
+            self._spent[name] = spent
+            return False
+        spent.append(now)
+        self._spent[name] = spent
+        return True
+
+    def _claim(self, cache: TTLCache, key: str) -> bool:
+        """Make sure only one worker refreshes a given entry.
+
+        The claim is held until the refreshed entry is due again, so another
+        worker whose local copy is older does not refresh it a second time.
+        """
+        store = shared_store()
+        if store is None:
+            return True
+        ttl = max(cache.ttl - self.lead_time, self.lead_time)
+        return store.incr("warm-claim", f"{cache.name}:{key}", ttl=ttl) == 1
+
+    def due(self, cache: TTLCache) -> List[str]:
+        """Hot keys of ``cache`` that expire within the lead time"""
+        keys = []
+        for arguments in self.static_keys.get(cache.name, []):
+            key, full_arguments = cache.key_for(arguments)
+            cache.remember(key, full_arguments)
+            keys.append(key)
+        keys.extend(cache.top_keys(self.top_k))
+
+        due = []
+        for key in dict.fromkeys(keys):
+            if cache.expires_in(key) > self.lead_time:
+                continue
+            # Another worker may already have refreshed it
+            cache.pull(key)
+            if cache.expires_in(key) <= self.lead_time:
+                due.append(key)
+        return due
+
+    async def refresh(self, cache: TTLCache, key: str) -> bool:
+        arguments = cache.arguments(key)
+        if arguments is None or cache.refresh is None:
+            return False
+        if not self._claim(cache, key) or not self._take_budget(cache.name):
+            return False
+        try:
+            value = await cache.refresh(**arguments)
+        except Exception as e:
+            logger.warning("Failed to warm %s %s: %s", cache.name, key, e)
+            return False
+        cache.set(key, value, arguments)
+        return True
+
+    async def tick(self) -> int:
+        """Refresh every due hot key once and return how many were refreshed"""
+        if time.monotonic() - self._last_decay >= 60:
+            for cache in self.caches.values():
+                cache.decay()
+            self._last_decay = time.monotonic()
+
+        jobs = [
+            self.refresh(cache, key)
+            for name in self.tools
+            if (cache := self.caches.get(name)) is not None
+            for key in self.due(cache)
+        ]
+        return sum(await asyncio.gather(*jobs))
+
+    async def run(self) -> None:
+        """Warm caches every ``interval`` seconds until cancelled"""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.tick()
+            except Exception:
+                logger.exception("Cache warmer tick failed")
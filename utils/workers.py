@@ -0,0 +1,141 @@
+import contextlib
+import logging
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from types import FrameType
+from typing import Dict, Iterator, List, Optional
+
+import uvicorn
+
+from utils.config import Settings
+
+logger = logging.getLogger(__name__)
+
+APP = "main:app"
+
+# Seconds to wait before restarting a worker group that exited unexpectedly
+RESTART_DELAY = 1.0
+
+
+def _uvicorn_command(
+    host: str, port: int, workers: int, log_level: str
+) -> List[str]:
+    return [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        APP,
+        "--host",
+        host,
+        "--port",
+        str(port),
+        "--workers",
+        str(workers),
+        "--log-level",
+        log_level,
+    ]
+
+
+def server_ports(settings: Settings, names: List[str]) -> Dict[str, int]:
+    """Port of each server's worker group in per-server mode"""
+    return {name: settings.port + index for index, name in enumerate(names)}
+
+
+@contextlib.contextmanager
+def shared_state(settings: Settings) -> Iterator[str]:
+    """Export SHARED_STATE_PATH to the workers, removing temporary files after"""
+    if settings.shared_state_path:
+        yield settings.shared_state_path
+        return
+
+    # A private (0700) directory, so other local users cannot plant the file
+    parent = "/dev/shm" if os.path.isdir("/dev/shm") else None
+    directory = tempfile.mkdtemp(prefix="fastapi-mcp-", dir=parent)
+    path = os.path.join(directory, "state.sqlite")
+    os.environ["SHARED_STATE_PATH"] = path
+    try:
+        yield path
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def run_shared(settings: Settings) -> None:
+    """Run ``settings.workers`` identical workers on one port.
+
+    Workers share caches and counters through a SharedStore file.
+    """
+    with shared_state(settings):
+        uvicorn.run(
+            APP,
+            host=settings.host,
+            port=settings.port,
+            workers=settings.workers,
+            log_level=settings.log_level,
+        )
+
+
+def run_per_server(settings: Settings, names: List[str]) -> None:
+    """Run each MCP server in its own group of ``settings.workers`` processes.
+
+    Server N of ``names`` listens on ``settings.port + N`` with only that server
+    mounted, so a CPU-heavy server cannot stall the others' event loops. Route
+    each mount path to its port at the ingress. Groups that exit unexpectedly
+    are restarted.
+    """
+    ports = server_ports(settings, names)
+    processes: Dict[str, subprocess.Popen] = {}
+    stopping = False
+
+    def start(name: str) -> None:
+        env = {**os.environ, "ENABLED_SERVERS": name}
+        command = _uvicorn_command(
+            settings.host, ports[name], settings.workers, settings.log_level
+        )
+        processes[name] = subprocess.Popen(command, env=env)
+        logger.info("Started %r on port %d", name, ports[name])
+
+    def stop(signum: int, frame: Optional[FrameType]) -> None:
+        nonlocal stopping
+        stopping = True
+        for process in processes.values():
+            if process.poll() is None:
+                process.send_signal(signal.SIGTERM)
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    with shared_state(settings):
+        for name in names:
+            start(name)
+
+        while not stopping:
+            time.sleep(0.5)
+            for name, process in list(processes.items()):
+                if process.poll() is not None and not stopping:
+                    logger.warning(
+                        "Worker group %r exited with %s, restarting",
+                        name,
+                        process.returncode,
+                    )
+                    time.sleep(RESTART_DELAY)
+                    start(name)
+
+        for process in processes.values():
+            process.wait()
+
+
+def run(settings: Settings, names: List[str]) -> None:
+    """Run the application according to ``WORKERS`` and ``WORKER_MODE``"""
+    if settings.worker_mode == "per-server":
+        run_per_server(settings, names)
+    elif settings.workers > 1:
+        run_shared(settings)
+    else:
+        uvicorn.run(
+            APP, host=settings.host, port=settings.port, log_level=settings.log_level
+        )